@@ -5,7 +5,7 @@ Singleton class to load and manage YAML config for signal callers.
 
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 
@@ -37,11 +37,16 @@ class CallersConfig:
         re.IGNORECASE
     )
 
+    # Literal that must be present for FALLBACK_DETECTION to match
+    FALLBACK_LITERAL = '#'
+
     def __init__(self):
         """Initialize config loader and load patterns from YAML."""
         self.config: Dict = {}
         self.callers: Dict[int, Dict] = {}
         self.patterns: Dict[str, Dict] = {}
+        # Detection rules per known caller (None = fallback), built on first use
+        self._detection_rules: Dict[Optional[int], List[Tuple[Optional[str], re.Pattern]]] = {}
         self._load_config()
 
     @classmethod
@@ -110,6 +115,7 @@ class CallersConfig:
         self.patterns = {
             'hashtag': {
                 'detect_compiled': [self.FALLBACK_DETECTION],
+                'detect_literal': self.FALLBACK_LITERAL,
                 'extract_compiled': None,
             }
         }
@@ -160,6 +166,9 @@ class CallersConfig:
                 pattern_def['detect_compiled'] = [
                     re.compile(detect_regex, flags)
                 ]
+                # Optional literal substring required by the detect regex,
+                # checked with a plain `in` before running the regex
+                pattern_def['detect_literal'] = pattern_def.get('literal') or None
 
                 # Compile extraction patterns if present
                 extract_def = pattern_def.get('extract')
@@ -196,6 +205,40 @@ class CallersConfig:
             result.extend(pattern_def.get('detect_compiled', []))
         return result if result else [self.FALLBACK_DETECTION]
 
+    def get_detection_rules(
+        self, user_id: Optional[int]
+    ) -> List[Tuple[Optional[str], re.Pattern]]:
+        """
+        Get detection patterns for a user paired with their literal pre-filter.
+
+        Args:
+            user_id: Telegram user ID, or None for fallback
+
+        Returns:
+            List of (literal, pattern) tuples. If literal is not None, the
+            pattern can only match text containing that literal substring.
+            The list is cached per caller and must not be modified.
+        """
+        # Unknown users all share the fallback rules
+        key = user_id if user_id and user_id in self.callers else None
+        cached = self._detection_rules.get(key)
+        if cached is not None:
+            return cached
+
+        pattern_names = self._get_pattern_names(key)
+        result = []
+        for pattern_name in pattern_names:
+            pattern_def = self.patterns.get(pattern_name, {})
+            literal = pattern_def.get('detect_literal')
+            result.extend(
+                (literal, pattern) for pattern in pattern_def.get('detect_compiled', [])
+            )
+        if not result:
+            result = [(self.FALLBACK_LITERAL, self.FALLBACK_DETECTION)]
+
+        self._detection_rules[key] = result
+        return result
+
     def get_extraction_patterns(
         self, user_id: Optional[int]
     ) -> Optional[Dict[str, re.Pattern]]:
@@ -110,8 +110,12 @@ class Config(BaseSettings):
         description="Timeout for vision API requests in seconds"
     )
     VISION_MAX_RETRIES: int = Field(
-        default=1,
-        description="Max retries per provider before fallback"
+        default=2,
+        description="Max retries per provider on transient errors before fallback"
+    )
+    VISION_MAX_CONCURRENT: int = Field(
+        default=4,
+        description="Max concurrent vision API requests (retries included)"
     )
 
     # ============ IMAGE EDITING ============
@@ -123,6 +127,10 @@ class Config(BaseSettings):
         default="gemini",
         description="Fallback image editor if primary fails"
     )
+    IMAGE_EDITOR_MAX_CONCURRENT: int = Field(
+        default=2,
+        description="Max concurrent image edit API calls"
+    )
     OPENAI_IMAGE_MODEL: str = Field(
         default="gpt-image-1",
         description="OpenAI model for image editing"
@@ -147,6 +155,14 @@ class Config(BaseSettings):
     POSTGRES_HOST: str = Field(default="db", description="PostgreSQL host")
     POSTGRES_PORT: int = Field(default=5432, description="PostgreSQL port")
     POSTGRES_SSLMODE: str = Field(default="prefer", description="SSL mode for PostgreSQL")
+    DB_POOL_MIN: int = Field(
+        default=4,
+        description="Connections opened when the pool is created (keep >= SIGNAL_WORKERS)"
+    )
+    DB_POOL_MAX: int = Field(
+        default=10,
+        description="Maximum connections in the database pool"
+    )
     SQLALCHEMY_ECHO: bool = Field(
         default=False,
         description="Enable SQLAlchemy SQL query logging"
@@ -183,6 +199,14 @@ class Config(BaseSettings):
         default=8000,
         description="Port for health check HTTP server"
     )
+    SIGNAL_QUEUE_SIZE: int = Field(
+        default=64,
+        description="Max queued messages before the reader waits for workers"
+    )
+    SIGNAL_WORKERS: int = Field(
+        default=4,
+        description="Number of workers processing queued signals and updates"
+    )
 
     # ============ MEDIA ============
     MEDIA_DOWNLOAD_DIR: str = Field(
@@ -51,8 +51,8 @@ async def init_db() -> asyncpg.Pool:
 
             _pool = await asyncpg.create_pool(
                 dsn=config.DATABASE_URL,
-                min_size=2,
-                max_size=10,
+                min_size=config.DB_POOL_MIN,
+                max_size=config.DB_POOL_MAX,
                 command_timeout=60,
                 statement_cache_size=0,  # Required for pgbouncer transaction mode
             )
@@ -73,12 +73,16 @@ async def init_db() -> asyncpg.Pool:
                 password=config.POSTGRES_PASSWORD,
                 database=config.POSTGRES_DB,
                 ssl=ssl,
-                min_size=2,
-                max_size=10,
+                min_size=config.DB_POOL_MIN,
+                max_size=config.DB_POOL_MAX,
                 command_timeout=60,
             )
 
-        logger.info("Database connection pool initialized")
+        # create_pool has already opened min_size connections (including the
+        # TLS handshake), so the first signals do not pay connection setup
+        logger.info("Database connection pool initialized",
+                    min_size=config.DB_POOL_MIN,
+                    max_size=config.DB_POOL_MAX)
         return _pool
 
 
@@ -250,12 +250,12 @@ async def handle_signal_update(event: NewMessage.Event) -> None:
         # Step 9: Cleanup with error handling
         if media_info and media_info.get('local_path'):
             try:
-                cleanup_media(media_info['local_path'])
+                await cleanup_media(media_info['local_path'])
             except Exception as cleanup_err:
                 logger.warning("Failed to cleanup media", error=str(cleanup_err))
 
         if edited_image_path:
             try:
-                cleanup_media(edited_image_path)
+                await cleanup_media(edited_image_path)
             except Exception as cleanup_err:
                 logger.warning("Failed to cleanup edited image", error=str(cleanup_err))
@@ -7,10 +7,15 @@ and the result dataclass for edit operations.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict, Optional
 
 from PIL import Image
 
+# Fast encoder settings for edited images (save is on the request critical path)
+PNG_SAVE_OPTIONS = {"compress_level": 1, "optimize": False}
+JPEG_SAVE_OPTIONS = {"quality": 90, "subsampling": 2, "optimize": False, "progressive": False}
+
 
 @dataclass
 class EditResult:
@@ -36,6 +41,39 @@ class EditResult:
             self.metadata = {}
 
 
+def save_edited_image(
+    edited_image: Image.Image,
+    output_path: str,
+    raw_bytes: Optional[bytes] = None
+) -> None:
+    """
+    Save an edited image to disk as cheaply as possible.
+
+    If the API already returned encoded bytes in the format implied by the
+    output path extension, they are written as-is without re-encoding.
+    Otherwise the image is encoded with fast PNG/JPEG settings.
+
+    Args:
+        edited_image: Edited PIL Image (opened from raw_bytes if given)
+        output_path: Destination file path
+        raw_bytes: Optional encoded image bytes returned by the API
+    """
+    target_format = Image.registered_extensions().get(Path(output_path).suffix.lower())
+
+    if raw_bytes is not None and target_format and edited_image.format == target_format:
+        Path(output_path).write_bytes(raw_bytes)
+        return
+
+    if target_format == "JPEG":
+        if edited_image.mode not in ("RGB", "L"):
+            edited_image = edited_image.convert("RGB")
+        edited_image.save(output_path, format="JPEG", **JPEG_SAVE_OPTIONS)
+    elif target_format == "PNG":
+        edited_image.save(output_path, format="PNG", **PNG_SAVE_OPTIONS)
+    else:
+        edited_image.save(output_path)
+
+
 class ImageEditor(ABC):
     """
     Abstract base class for image editors.
@@ -59,7 +97,8 @@ class ImageEditor(ABC):
         self,
         image_path: str,
         translations: Dict[str, str],
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        image_bytes: Optional[bytes] = None
     ) -> EditResult:
         """
         Edit an image by replacing text according to translations.
@@ -68,6 +107,8 @@ class ImageEditor(ABC):
             image_path: Path to the input image file
             translations: Dictionary mapping original text to replacement text
             output_path: Optional path to save the edited image
+            image_bytes: Contents of image_path if the caller already read
+                them; the file is then not read again
 
         Returns:
             EditResult with success status and edited image (or error)
@@ -94,6 +135,22 @@ class ImageEditor(ABC):
         """
         pass
 
+    def warmup(self) -> None:
+        """
+        Pre-load heavy dependencies so the first edit does not pay for them.
+
+        Default implementation does nothing; editors with lazy clients override it.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Release any resources (API clients, connection pools) held by the editor.
+
+        Default implementation does nothing; editors holding clients override it.
+        """
+        pass
+
     @property
     @abstractmethod
     def name(self) -> str:
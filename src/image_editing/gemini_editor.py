@@ -6,17 +6,141 @@ to perform AI-powered image text editing by translating Russian to English.
 """
 
 import asyncio
-from typing import Dict, Optional
+import threading
+from io import BytesIO
+from typing import Dict, Optional, Tuple
 
+import httpx
 import structlog
 from PIL import Image
 
 from src.config import config
-from src.image_editing.base import EditResult, ImageEditor
+from src.image_editing.base import EditResult, ImageEditor, save_edited_image
 from src.utils.security import validate_image_file
 
 logger = structlog.get_logger(__name__)
 
+# Connection pool shared by all Gemini editors, so an editor rebuilt after
+# close() (or a second editor from the factory) reuses warm connections
+# instead of redoing the TCP+TLS handshake. genai.Client.close() leaves a
+# caller-supplied pool open. Edits run concurrently from worker threads, so
+# HTTP/2 multiplexes them over one connection where the server allows it.
+_HTTP_MAX_CONNECTIONS = 32
+_HTTP_KEEPALIVE_EXPIRY_SEC = 60.0
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+# Source images larger than this (longest side, px) are sent as a
+# downscaled JPEG; Gemini works on ~1.5K px tiles, so extra pixels only
+# add upload bytes and server-side preprocessing
+_INPUT_MAX_DIMENSION = 1568
+_INPUT_JPEG_QUALITY = 85
+
+
+# Editing rules shared by every request, sent as the system instruction so
+# the per-request prompt only carries the replacement list
+_SYSTEM_INSTRUCTION = """PRESERVE (keep exactly as is):
+- Font style, size, weight, and color of all text
+- Text position, alignment, and spacing
+- All charts, candlesticks, and technical indicators
+- Price scale, axis labels, and grid lines on the right side
+- All other text elements not listed for replacement
+- Background colors and overall composition
+- Image dimensions and aspect ratio
+- Border lines, boxes, and decorative elements
+
+DO NOT:
+- Add any watermarks, logos, or signatures
+- Crop, resize, or change image dimensions
+- Change the input aspect ratio
+- Modify charts, indicators, or graphical elements
+- Change colors, fonts, or styling
+- Alter any text not explicitly listed for replacement
+- Add or remove any visual elements
+
+Replace ONLY the specified text while maintaining perfect visual consistency with the original image."""
+
+
+def _prepare_input_image(image_data: bytes) -> Tuple[bytes, str]:
+    """
+    Get the bytes and MIME type to send for a source image.
+
+    Args:
+        image_data: Encoded source image
+
+    Returns:
+        Tuple of (image bytes, MIME type): the original bytes when the
+        image is small enough or unreadable by PIL, otherwise a
+        downscaled JPEG
+    """
+    try:
+        img = Image.open(BytesIO(image_data))
+    except Exception as e:
+        logger.debug("Could not open image for downscaling", error=str(e))
+        return image_data, "image/jpeg"
+
+    with img:
+        mime_type = Image.MIME.get(img.format, "image/jpeg")
+        if max(img.size) <= _INPUT_MAX_DIMENSION:
+            return image_data, mime_type
+
+        original_size = img.size
+        img.thumbnail((_INPUT_MAX_DIMENSION, _INPUT_MAX_DIMENSION), reducing_gap=3.0)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        buffer = BytesIO()
+        img.save(buffer, "JPEG", quality=_INPUT_JPEG_QUALITY)
+
+    logger.debug("Downscaled image for Gemini edit",
+                 original_size=original_size,
+                 original_bytes=len(image_data),
+                 upload_bytes=buffer.tell())
+    return buffer.getvalue(), "image/jpeg"
+
+
+def _first_image_part(stream):
+    """
+    Get the first inline image part from a streamed Gemini response.
+
+    Args:
+        stream: Iterator of response chunks from generate_content_stream
+
+    Returns:
+        The first part carrying image data, or None if the stream has none
+    """
+    for chunk in stream:
+        if not chunk.candidates or not chunk.candidates[0].content:
+            continue
+        for part in chunk.candidates[0].content.parts or ():
+            inline_data = getattr(part, "inline_data", None)
+            if inline_data and (inline_data.mime_type or "image/").startswith("image/"):
+                return part
+    return None
+
+
+def _get_http_client() -> httpx.Client:
+    """Get or create the shared HTTP client for Gemini requests (thread-safe)."""
+    global _http_client
+
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=_HTTP_MAX_CONNECTIONS,
+                        keepalive_expiry=_HTTP_KEEPALIVE_EXPIRY_SEC
+                    ),
+                    # The SDK sets per-request timeouts from HttpOptions
+                    timeout=None
+                )
+                logger.debug("Gemini HTTP client created")
+    return _http_client
+
 
 class GeminiImageEditor(ImageEditor):
     """
@@ -38,6 +162,7 @@ class GeminiImageEditor(ImageEditor):
         self.api_key = api_key or config.GEMINI_API_KEY
         self.model = model or config.GEMINI_IMAGE_MODEL
         self._client = None
+        self._client_lock = threading.Lock()
         logger.info("GeminiImageEditor initialized", model=self.model)
 
     @property
@@ -55,22 +180,44 @@ class GeminiImageEditor(ImageEditor):
         return bool(self.api_key)
 
     def _get_client(self):
-        """Lazy-load the Gemini client."""
+        """Lazy-load the Gemini client (thread-safe)."""
         if self._client is None:
-            try:
-                from google import genai
-                self._client = genai.Client(api_key=self.api_key)
-                logger.info("Gemini client initialized")
-            except ImportError as e:
-                logger.error("Failed to import google.genai", error=str(e))
-                raise RuntimeError("google-genai library not installed") from e
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        from google import genai
+                        from google.genai import types
+                        self._client = genai.Client(
+                            api_key=self.api_key,
+                            http_options=types.HttpOptions(httpx_client=_get_http_client())
+                        )
+                        logger.info("Gemini client initialized")
+                    except ImportError as e:
+                        logger.error("Failed to import google.genai", error=str(e))
+                        raise RuntimeError("google-genai library not installed") from e
         return self._client
 
+    def warmup(self) -> None:
+        """Import the Gemini SDK and build the client ahead of the first edit."""
+        if self.is_available():
+            self._get_client()
+
+    def close(self) -> None:
+        """Close the Gemini client (the shared connection pool stays open)."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            try:
+                client.close()
+            except Exception as e:
+                logger.debug("Error closing Gemini client", error=str(e))
+
     def edit_image(
         self,
         image_path: str,
         translations: Dict[str, str],
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        image_bytes: Optional[bytes] = None
     ) -> EditResult:
         """
         Edit image using Gemini AI.
@@ -80,6 +227,7 @@ class GeminiImageEditor(ImageEditor):
             translations: Dict mapping original text to replacement text
                          (used to build the prompt)
             output_path: Optional path to save edited image
+            image_bytes: Already-read contents of image_path (optional)
 
         Returns:
             EditResult with success status and edited image
@@ -113,37 +261,39 @@ class GeminiImageEditor(ImageEditor):
             # Build prompt from translations
             prompt = self._build_prompt(translations)
 
-            # Load image
-            with open(image_path, "rb") as f:
-                image_data = f.read()
+            # Load image (unless the caller already has the bytes)
+            image_data = image_bytes
+            if image_data is None:
+                with open(image_path, "rb") as f:
+                    image_data = f.read()
 
             client = self._get_client()
 
-            # Create image part using new google-genai API
+            # Create image part using new google-genai API (large
+            # screenshots are sent downscaled)
             from google.genai import types
-            image_part = types.Part.from_bytes(data=image_data, mime_type="image/jpeg")
+            upload_data, mime_type = _prepare_input_image(image_data)
+            image_part = types.Part.from_bytes(data=upload_data, mime_type=mime_type)
+
+            # The preservation rules only make sense for a list of
+            # replacements; the translate-everything prompt goes without them
+            generation_config = None
+            if translations:
+                generation_config = types.GenerateContentConfig(
+                    system_instruction=_SYSTEM_INSTRUCTION
+                )
 
-            # Call Gemini API (synchronous)
-            response = client.models.generate_content(
+            # Call Gemini API (synchronous, streamed so any text the model
+            # appends after the image is not waited for)
+            stream = client.models.generate_content_stream(
                 model=self.model,
-                contents=[prompt, image_part]
+                contents=[prompt, image_part],
+                config=generation_config
             )
-
-            # Extract image from response
-            if not response.candidates or not response.candidates[0].content.parts:
-                logger.error("Gemini returned empty response")
-                return EditResult(
-                    success=False,
-                    error="Gemini returned empty response",
-                    method=self.name
-                )
-
-            # Find the image part in the response
-            image_part = None
-            for part in response.candidates[0].content.parts:
-                if hasattr(part, 'inline_data') and part.inline_data:
-                    image_part = part
-                    break
+            try:
+                image_part = _first_image_part(stream)
+            finally:
+                stream.close()
 
             if not image_part:
                 logger.error("No image found in Gemini response")
@@ -154,12 +304,12 @@ class GeminiImageEditor(ImageEditor):
                 )
 
             # Convert bytes to PIL Image
-            from io import BytesIO
-            edited_image = Image.open(BytesIO(image_part.inline_data.data))
+            image_bytes = image_part.inline_data.data
+            edited_image = Image.open(BytesIO(image_bytes))
 
             # Save if output path specified
             if output_path:
-                edited_image.save(output_path, quality=95)
+                save_edited_image(edited_image, output_path, raw_bytes=image_bytes)
                 logger.info("Gemini edited image saved", path=output_path)
 
             logger.info("Gemini editing successful")
@@ -217,7 +367,8 @@ class GeminiImageEditor(ImageEditor):
             translations: Dict mapping original text to replacement text
 
         Returns:
-            Detailed prompt string for Gemini with explicit preservation instructions
+            Prompt string for Gemini (with translations, the preservation
+            rules are sent separately as _SYSTEM_INSTRUCTION)
         """
         if not translations:
             return (
@@ -233,25 +384,4 @@ class GeminiImageEditor(ImageEditor):
 
         return f"""This is a trading signal image. Replace the following text:
 
-{replacements_list}
-
-PRESERVE (keep exactly as is):
-- Font style, size, weight, and color of all text
-- Text position, alignment, and spacing
-- All charts, candlesticks, and technical indicators
-- Price scale, axis labels, and grid lines on the right side
-- All other text elements not listed for replacement
-- Background colors and overall composition
-- Image dimensions and aspect ratio
-- Border lines, boxes, and decorative elements
-
-DO NOT:
-- Add any watermarks, logos, or signatures
-- Crop, resize, or change image dimensions
-- Change the input aspect ratio
-- Modify charts, indicators, or graphical elements
-- Change colors, fonts, or styling
-- Alter any text not explicitly listed for replacement
-- Add or remove any visual elements
-
-Replace ONLY the specified text while maintaining perfect visual consistency with the original image."""
+{replacements_list}"""
@@ -6,18 +6,61 @@ to perform AI-powered image text editing.
 """
 
 import asyncio
+import mmap
+import shutil
+import threading
+from contextlib import contextmanager
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
 
+import httpx
+import pybase64
 import structlog
+from openai import OpenAI
 from PIL import Image
 
 from src.config import config
-from src.image_editing.base import EditResult, ImageEditor
+from src.image_editing.base import EditResult, ImageEditor, save_edited_image
 from src.utils.security import validate_image_file
 
 logger = structlog.get_logger(__name__)
 
+# Timeout for downloading a result image returned as a URL (legacy API)
+_IMAGE_DOWNLOAD_TIMEOUT_SEC = 30
+
+# Static prompt parts - only the replacement list between them varies per call
+_PROMPT_NO_TRANSLATIONS = (
+    "Translate all Russian text in this image to English. "
+    "Preserve the original formatting, colors, and layout exactly."
+)
+
+_PROMPT_HEADER = """This is a trading signal image. Replace the following text:
+
+"""
+
+_PROMPT_FOOTER = """
+
+PRESERVE (keep exactly as is):
+- Font style, size, weight, and color of all text
+- Text position, alignment, and spacing
+- All charts, candlesticks, and technical indicators
+- Price scale, axis labels, and grid lines on the right side
+- All other text elements not listed for replacement
+- Background colors and overall composition
+- Image dimensions and aspect ratio
+- Border lines, boxes, and decorative elements
+
+DO NOT:
+- Add any watermarks, logos, or signatures
+- Crop, resize, or change image dimensions
+- Modify charts, indicators, or graphical elements
+- Change colors, fonts, or styling
+- Alter any text not explicitly listed for replacement
+- Add or remove any visual elements
+
+Replace ONLY the specified text while maintaining perfect visual consistency with the original image."""
+
 
 class OpenAIImageEditor(ImageEditor):
     """
@@ -39,6 +82,7 @@ class OpenAIImageEditor(ImageEditor):
         self.api_key = api_key or (config.OPENAI_API_KEY or "")
         self.model = model or config.OPENAI_IMAGE_MODEL
         self._client = None
+        self._client_lock = threading.Lock()
         logger.info("OpenAIImageEditor initialized", model=self.model)
 
     @property
@@ -56,17 +100,29 @@ class OpenAIImageEditor(ImageEditor):
         return bool(self.api_key)
 
     def _get_client(self):
-        """Lazy-load the OpenAI client."""
+        """Lazy-load the OpenAI client (thread-safe)."""
         if self._client is None:
-            try:
-                from openai import OpenAI
-                self._client = OpenAI(api_key=self.api_key)
-                logger.info("OpenAI client initialized")
-            except ImportError as e:
-                logger.error("Failed to import openai", error=str(e))
-                raise RuntimeError("openai library not installed") from e
+            with self._client_lock:
+                if self._client is None:
+                    self._client = OpenAI(api_key=self.api_key)
+                    logger.info("OpenAI client initialized")
         return self._client
 
+    def warmup(self) -> None:
+        """Build the OpenAI client ahead of the first edit."""
+        if self.is_available():
+            self._get_client()
+
+    def close(self) -> None:
+        """Close the underlying OpenAI client and its connection pool."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            try:
+                client.close()
+            except Exception as e:
+                logger.debug("Error closing OpenAI client", error=str(e))
+
     # Supported sizes by OpenAI Images Edit API
     SUPPORTED_SIZES = {
         "1024x1024": 1.0,      # square
@@ -74,7 +130,7 @@ class OpenAIImageEditor(ImageEditor):
         "1024x1536": 0.667,    # portrait
     }
 
-    def _get_output_size(self, image_path: str) -> str:
+    def _get_output_size(self, image_size: Tuple[int, int]) -> str:
         """
         Choose the best supported output size based on input image aspect ratio.
 
@@ -87,10 +143,12 @@ class OpenAIImageEditor(ImageEditor):
         - Landscape (width > height * 1.1) → 1536x1024
         - Portrait (height > width * 1.1) → 1024x1536
         - Near-square → 1024x1024
+
+        Args:
+            image_size: (width, height) of the input image
         """
-        with Image.open(image_path) as img:
-            width, height = img.size
-            aspect_ratio = width / height
+        width, height = image_size
+        aspect_ratio = width / height
 
         # Use thresholds to preserve orientation
         if width > height * 1.1:
@@ -116,7 +174,8 @@ class OpenAIImageEditor(ImageEditor):
         self,
         image_path: str,
         translations: Dict[str, str],
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        image_bytes: Optional[bytes] = None
     ) -> EditResult:
         """
         Edit image using OpenAI's image editing API.
@@ -125,13 +184,11 @@ class OpenAIImageEditor(ImageEditor):
             image_path: Path to input image
             translations: Dict mapping original text to replacement text
             output_path: Optional path to save edited image
+            image_bytes: Already-read contents of image_path (optional)
 
         Returns:
             EditResult with success status and edited image
         """
-        # Initialize mask_path before try block
-        mask_path = None
-
         try:
             if not self.is_available():
                 logger.error("OpenAI editor not available - API key missing")
@@ -150,6 +207,10 @@ class OpenAIImageEditor(ImageEditor):
                     method=self.name
                 )
 
+            # Nothing to replace - skip the API round trip entirely
+            if not translations:
+                return self._skip_edit(image_path, output_path)
+
             logger.info(
                 "OpenAI editing image",
                 image_path=image_path,
@@ -161,82 +222,78 @@ class OpenAIImageEditor(ImageEditor):
             # Build prompt from translations
             prompt = self._build_prompt(translations)
 
-            # Choose output size based on input aspect ratio
-            output_size = self._get_output_size(image_path)
+            # One buffer serves both PIL (header only) and the SDK upload
+            with self._source_buffer(image_path, image_bytes) as image_buffer:
+                with Image.open(image_buffer) as img:
+                    image_size = img.size
 
-            # Create mask for text regions (simple approach: white mask)
-            # OpenAI uses the mask to determine which areas to edit
-            mask_path = self._create_mask(image_path)
+                # Choose output size based on input aspect ratio
+                output_size = self._get_output_size(image_size)
+
+                # Create mask for text regions (simple approach: white mask)
+                # OpenAI uses the mask to determine which areas to edit
+                mask_bytes = self._create_mask(image_size)
 
-            try:
                 client = self._get_client()
 
-                # Open image and mask files
-                with open(image_path, "rb") as image_file, open(mask_path, "rb") as mask_file:
-                    # Call OpenAI image edit API
-                    response = client.images.edit(
-                        model=self.model,
-                        image=image_file,
-                        mask=mask_file,
-                        prompt=prompt,
-                        n=1,
-                        size=output_size
-                    )
-
-                if not response.data:
-                    logger.error("OpenAI returned empty response")
-                    return EditResult(
-                        success=False,
-                        error="OpenAI returned empty response",
-                        method=self.name
-                    )
-
-                # Get the edited image (supports both URL and base64 response)
-                import base64
-                from io import BytesIO
-
-                image_data = response.data[0]
-
-                if image_data.b64_json:
-                    # New API returns base64 encoded image
-                    image_bytes = base64.b64decode(image_data.b64_json)
-                    edited_image = Image.open(BytesIO(image_bytes))
-                elif image_data.url:
-                    # Legacy API returns URL
-                    import requests
-                    image_response = requests.get(image_data.url)
-                    image_response.raise_for_status()
-                    edited_image = Image.open(BytesIO(image_response.content))
-                else:
-                    logger.error("OpenAI response has neither URL nor b64_json")
-                    return EditResult(
-                        success=False,
-                        error="OpenAI response has no image data",
-                        method=self.name
-                    )
-
-                # Save if output path specified
-                if output_path:
-                    edited_image.save(output_path, quality=95)
-                    logger.info("OpenAI edited image saved", path=output_path)
-
-                logger.info("OpenAI editing successful")
+                # Call OpenAI image edit API
+                image_buffer.seek(0)
+                response = client.images.edit(
+                    model=self.model,
+                    image=(Path(image_path).name, image_buffer),
+                    mask=("mask.png", mask_bytes, "image/png"),
+                    prompt=prompt,
+                    n=1,
+                    size=output_size
+                )
+
+            if not response.data:
+                logger.error("OpenAI returned empty response")
+                return EditResult(
+                    success=False,
+                    error="OpenAI returned empty response",
+                    method=self.name
+                )
+
+            # Get the edited image (supports both URL and base64 response)
+            image_data = response.data[0]
+
+            if image_data.b64_json:
+                # New API returns base64 encoded image. Decode once and let
+                # PIL read straight from that buffer (BytesIO shares it).
+                image_bytes = self._decode_b64_image(image_data.b64_json)
+            elif image_data.url:
+                # Legacy API returns URL
+                image_response = httpx.get(image_data.url, timeout=_IMAGE_DOWNLOAD_TIMEOUT_SEC)
+                image_response.raise_for_status()
+                image_bytes = image_response.content
+            else:
+                logger.error("OpenAI response has neither URL nor b64_json")
                 return EditResult(
-                    success=True,
-                    edited_image=edited_image,
-                    method=self.name,
-                    metadata={
-                        "input_path": image_path,
-                        "output_path": output_path,
-                        "model": self.model,
-                        "num_translations": len(translations)
-                    }
+                    success=False,
+                    error="OpenAI response has no image data",
+                    method=self.name
                 )
 
-            finally:
-                # Clean up temporary mask file
-                if mask_path and Path(mask_path).exists():
-                    Path(mask_path).unlink()
+            edited_image = Image.open(BytesIO(image_bytes))
+
+            # Save if output path specified
+            if output_path:
+                save_edited_image(edited_image, output_path, raw_bytes=image_bytes)
+                logger.info("OpenAI edited image saved", path=output_path)
+
+            logger.info("OpenAI editing successful")
+            return EditResult(
+                success=True,
+                edited_image=edited_image,
+                method=self.name,
+                metadata={
+                    "input_path": image_path,
+                    "output_path": output_path,
+                    "model": self.model,
+                    "num_translations": len(translations)
+                }
+            )
 
         except Exception as e:
             logger.error("OpenAI editing error", error=str(e), exc_info=True)
@@ -256,6 +313,7 @@ class OpenAIImageEditor(ImageEditor):
         Async version of edit_image.
 
         Runs the synchronous operation in a thread pool to avoid blocking.
+        Empty translations are short-circuited there without an API call.
 
         Args:
             image_path: Path to input image
@@ -272,10 +330,79 @@ class OpenAIImageEditor(ImageEditor):
             output_path=output_path
         )
 
+    @staticmethod
+    @contextmanager
+    def _source_buffer(image_path: str, image_bytes: Optional[bytes]) -> Iterator[BinaryIO]:
+        """
+        Yield a readable buffer over the source image.
+
+        Uses the caller's bytes when given; otherwise maps the file so the
+        upload reads straight from the page cache.
+        """
+        if image_bytes is not None:
+            yield BytesIO(image_bytes)
+            return
+
+        with open(image_path, "rb") as image_file, \
+                mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as image_buffer:
+            yield image_buffer
+
+    def _skip_edit(self, image_path: str, output_path: Optional[str]) -> EditResult:
+        """
+        Return the original image unchanged when there is nothing to replace.
+
+        Args:
+            image_path: Path to input image
+            output_path: Optional path to save the (unchanged) image
+
+        Returns:
+            EditResult with the original image and metadata["skipped"] set
+        """
+        logger.info("OpenAI edit skipped - no translations", image_path=image_path)
+
+        with Image.open(image_path) as img:
+            original_image = img.copy()
+
+        if output_path:
+            shutil.copyfile(image_path, output_path)
+
+        return EditResult(
+            success=True,
+            edited_image=original_image,
+            method=self.name,
+            metadata={
+                "input_path": image_path,
+                "output_path": output_path,
+                "model": self.model,
+                "num_translations": 0,
+                "skipped": True
+            }
+        )
+
+    @staticmethod
+    def _decode_b64_image(b64_data: str) -> bytes:
+        """
+        Decode a base64 image payload returned by the API.
+
+        Uses pybase64's SIMD decoder without the validation pass done by
+        base64.b64decode; the payloads are multi-MB b64_json responses.
+        The returned bytes object is the only decoded copy of the image.
+
+        Args:
+            b64_data: Base64 encoded image data
+
+        Returns:
+            Raw encoded image bytes (e.g. PNG)
+        """
+        return pybase64.b64decode(b64_data, validate=False)
+
     def _build_prompt(self, translations: Dict[str, str]) -> str:
         """
         Build a detailed prompt for OpenAI based on the translations.
 
+        Only the replacement list is built per call; the surrounding
+        instructions are module-level constants.
+
         Args:
             translations: Dict mapping original text to replacement text
 
@@ -283,10 +410,7 @@ class OpenAIImageEditor(ImageEditor):
             Detailed prompt string for OpenAI with explicit preservation instructions
         """
         if not translations:
-            return (
-                "Translate all Russian text in this image to English. "
-                "Preserve the original formatting, colors, and layout exactly."
-            )
+            return _PROMPT_NO_TRANSLATIONS
 
         # Build bullet list of replacements
         replacements_list = "\n".join(
@@ -294,59 +418,32 @@ class OpenAIImageEditor(ImageEditor):
             for orig, trans in translations.items()
         )
 
-        return f"""This is a trading signal image. Replace the following text:
-
-{replacements_list}
-
-PRESERVE (keep exactly as is):
-- Font style, size, weight, and color of all text
-- Text position, alignment, and spacing
-- All charts, candlesticks, and technical indicators
-- Price scale, axis labels, and grid lines on the right side
-- All other text elements not listed for replacement
-- Background colors and overall composition
-- Image dimensions and aspect ratio
-- Border lines, boxes, and decorative elements
-
-DO NOT:
-- Add any watermarks, logos, or signatures
-- Crop, resize, or change image dimensions
-- Modify charts, indicators, or graphical elements
-- Change colors, fonts, or styling
-- Alter any text not explicitly listed for replacement
-- Add or remove any visual elements
-
-Replace ONLY the specified text while maintaining perfect visual consistency with the original image."""
+        return _PROMPT_HEADER + replacements_list + _PROMPT_FOOTER
 
-    def _create_mask(self, image_path: str) -> str:
+    def _create_mask(self, image_size: Tuple[int, int]) -> bytes:
         """
         Create a mask for the image.
 
         For simplicity, creates a white mask (edit entire image).
         A more sophisticated approach would detect text regions.
+        The mask is encoded in memory; no temporary file is written.
 
         Args:
-            image_path: Path to the input image
+            image_size: (width, height) of the input image
 
         Returns:
-            Path to the created mask file
+            PNG-encoded mask bytes
         """
         try:
-            # Load original image
-            with Image.open(image_path) as img:
-                # Convert to RGBA
-                img_rgba = img.convert("RGBA")
-
-                # Create a white mask (fully opaque)
-                # OpenAI uses transparent areas as the edit region
-                mask = Image.new("RGBA", img_rgba.size, (255, 255, 255, 255))
+            # Create a white mask (fully opaque)
+            # OpenAI uses transparent areas as the edit region
+            mask = Image.new("RGBA", image_size, (255, 255, 255, 255))
 
-                # Save mask to temporary file
-                mask_path = str(Path(image_path).parent / f"{Path(image_path).stem}_mask.png")
-                mask.save(mask_path)
+            buffer = BytesIO()
+            mask.save(buffer, format="PNG")
 
-                logger.debug("Created mask for OpenAI", mask_path=mask_path)
-                return mask_path
+            logger.debug("Created mask for OpenAI", mask_size=image_size)
+            return buffer.getvalue()
 
         except Exception as e:
             logger.error("Failed to create mask", error=str(e))
@@ -9,9 +9,10 @@ An asynchronous service that:
 """
 
 import asyncio
+import os
 import signal
 import sys
-from typing import Set
+from collections import OrderedDict
 
 from telethon import events
 
@@ -20,10 +21,11 @@ from src.config import config
 from src.db.connection import close_db, init_db
 from src.handlers.signal_handler import handle_new_signal
 from src.handlers.update_handler import handle_signal_update
+from src.media.downloader import ensure_download_dir
+from src.ocr.image_editor import close_image_editor, warmup_image_editor, warmup_vision_chain
 from src.parsers.signal_parser import is_signal
 from src.telethon_setup import (
     disconnect_clients,
-    get_reader_client,
     init_clients,
     verify_group_access,
 )
@@ -33,30 +35,68 @@ from src.utils.logger import get_logger, setup_logging
 setup_logging(config.LOG_LEVEL, config.ENVIRONMENT)
 logger = get_logger(__name__)
 
+# Seconds to wait for shutdown cleanup before forcing the process to exit.
+# Applies to the queue drain and to _cleanup() in turn; stop_grace_period in
+# docker-compose.yml must cover both.
+SHUTDOWN_TIMEOUT_SEC = 30
+
+# Number of recent message IDs remembered to drop redelivered messages
+SEEN_MESSAGE_IDS_MAX = 4096
+
 # Global state for graceful shutdown
 _shutdown_event: asyncio.Event = None
-_running_tasks: Set[asyncio.Task] = set()
+_signal_queue: asyncio.Queue = None
+_seen_message_ids: "OrderedDict[int, None]" = OrderedDict()
+
+
+class TerminateTaskGroup(Exception):
+    """Raised inside the main task group to stop all of its tasks."""
+
+
+async def _terminate_on_shutdown() -> None:
+    """
+    Wait for the shutdown event, then unwind the main task group.
 
+    Queued and in-flight messages get up to SHUTDOWN_TIMEOUT_SEC to finish
+    before the workers are cancelled.
+    """
+    await _shutdown_event.wait()
+    try:
+        await asyncio.wait_for(_signal_queue.join(), timeout=SHUTDOWN_TIMEOUT_SEC)
+    except TimeoutError:
+        logger.warning("Timed out draining signal queue, cancelling workers",
+                      queued=_signal_queue.qsize(),
+                      timeout_sec=SHUTDOWN_TIMEOUT_SEC)
+    raise TerminateTaskGroup()
 
-def _task_done_callback(task: asyncio.Task) -> None:
-    """Remove completed task from tracking set and log errors."""
-    _running_tasks.discard(task)
-    if task.cancelled():
-        return
-    exc = task.exception()
-    if exc:
-        logger.error("Background task failed",
-                    task_name=task.get_name(),
-                    error=str(exc),
-                    exc_info=exc)
 
+async def _run_reader(reader) -> None:
+    """Run the reader client; unwind the main task group once it stops."""
+    await reader.run_until_disconnected()
+    raise TerminateTaskGroup()
 
-def create_tracked_task(coro, name: str = None) -> asyncio.Task:
-    """Create an asyncio task that is tracked for graceful shutdown."""
-    task = asyncio.create_task(coro, name=name)
-    _running_tasks.add(task)
-    task.add_done_callback(_task_done_callback)
-    return task
+
+async def signal_worker(queue: asyncio.Queue, worker_id: int) -> None:
+    """
+    Consume queued messages and dispatch them to their handler.
+
+    Args:
+        queue: Queue of (handler, event) tuples filled by on_new_message
+        worker_id: Worker number, used for logging
+    """
+    while True:
+        handler, event = await queue.get()
+        try:
+            await handler(event)
+        except Exception as e:
+            logger.error("Signal worker handler failed",
+                        worker_id=worker_id,
+                        handler=handler.__name__,
+                        message_id=event.message.id,
+                        error=str(e),
+                        exc_info=True)
+        finally:
+            queue.task_done()
 
 
 def _handle_shutdown_signal() -> None:
@@ -75,7 +115,15 @@ def register_handlers(reader_client) -> None:
     - Signal update (reply to existing signal)
     """
 
-    @reader_client.on(events.NewMessage(chats=[config.SOURCE_GROUP_ID], incoming=True, outgoing=True))
+    # Own messages are only needed for testing; in production Telethon drops
+    # them before they reach the handler
+    process_outgoing = config.ENVIRONMENT != "production"
+
+    @reader_client.on(events.NewMessage(
+        chats=[config.SOURCE_GROUP_ID],
+        incoming=True,
+        outgoing=process_outgoing
+    ))
     async def on_new_message(event):
         """
         Handle any new message in the source group.
@@ -85,21 +133,43 @@ def register_handlers(reader_client) -> None:
         - If is a reply (to any message) -> handle_signal_update (checks if parent is signal)
         - Otherwise -> ignore
 
-        Note: incoming=True, outgoing=True allows receiving both:
-        - Messages from other users (incoming)
-        - Messages from the reader account itself (outgoing) - useful for testing
-        In production, you may want to set outgoing=False to only process others' messages.
+        Matched messages are put on the bounded signal queue; when it is
+        full this handler waits, back-pressuring the reader instead of
+        spawning an unbounded number of tasks.
+
+        Note: messages from other users (incoming) are always received.
+        Messages from the reader account itself (outgoing) are received only
+        when ENVIRONMENT is not "production" - useful for testing.
         """
+        if _shutdown_event.is_set():
+            # Draining for shutdown - accept no new work
+            return
+
         message = event.message
+
+        # Telethon can redeliver messages after a reconnect
+        if message.id in _seen_message_ids:
+            logger.debug("Duplicate message delivery ignored", message_id=message.id)
+            return
+        _seen_message_ids[message.id] = None
+        if len(_seen_message_ids) > SEEN_MESSAGE_IDS_MAX:
+            _seen_message_ids.popitem(last=False)
+
+        # Media-only messages (stickers, photos without caption) that are not
+        # replies can never match; check the raw text so Telethon does not
+        # build the markdown message.text for them
+        if not message.message and not message.is_reply:
+            return
+
         text = message.text or ''
 
         try:
             if is_signal(text, user_id=message.sender_id):
                 # New signal with #Идея marker
-                create_tracked_task(handle_new_signal(event), name=f"signal_{message.id}")
+                await _signal_queue.put((handle_new_signal, event))
             elif message.is_reply:
                 # Reply to some message - handler will check if parent is a signal
-                create_tracked_task(handle_signal_update(event), name=f"update_{message.id}")
+                await _signal_queue.put((handle_signal_update, event))
             # else: regular message without #Идея and not a reply - ignore
         except Exception as e:
             logger.error("Error dispatching message handler",
@@ -108,40 +178,46 @@ def register_handlers(reader_client) -> None:
                         exc_info=True)
 
     logger.info("Event handlers registered",
-                source_group=config.SOURCE_GROUP_ID)
+                source_group=config.SOURCE_GROUP_ID,
+                process_outgoing=process_outgoing)
 
 
-async def health_check_loop():
+async def watch_client_connections(reader, publisher) -> None:
     """
-    Periodic health check for database and client connections.
+    Wait for a Telethon client to disconnect for good and trigger shutdown.
 
-    Runs every 5 minutes to verify:
-    - Database connection pool is healthy
-    - Telethon clients are connected
-    """
-    while True:
-        await asyncio.sleep(300)  # 5 minutes
+    Telethon retries dropped connections on its own and only resolves
+    client.disconnected once it gives up, so no polling is needed. The
+    database is not polled either: asyncpg replaces broken pool
+    connections on acquire, and /health probes it on demand.
 
-        try:
-            # Check database
-            from src.db.connection import get_pool
-            pool = get_pool()
-            async with pool.acquire() as conn:
-                await conn.execute("SELECT 1")
+    Args:
+        reader: Reader Telegram client
+        publisher: Publisher Telegram client
+    """
+    waiters = {
+        asyncio.ensure_future(reader.disconnected): "reader",
+        asyncio.ensure_future(publisher.disconnected): "publisher",
+    }
+    try:
+        done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        for waiter in waiters:
+            waiter.cancel()
+        raise
 
-            # Check Telethon clients
-            reader = get_reader_client()
-            if not reader.is_connected():
-                logger.warning("Health check: Reader client disconnected")
-
-        except Exception as e:
-            logger.error("Health check failed", error=str(e))
+    for waiter in done:
+        logger.error("Telegram client disconnected", client=waiters[waiter])
+    for waiter in waiters:
+        waiter.cancel()
+    _handle_shutdown_signal()
 
 
 async def main():
     """Main entry point with graceful shutdown support."""
-    global _shutdown_event
+    global _shutdown_event, _signal_queue
     _shutdown_event = asyncio.Event()
+    _signal_queue = asyncio.Queue(maxsize=config.SIGNAL_QUEUE_SIZE)
 
     # Setup signal handlers
     loop = asyncio.get_event_loop()
@@ -153,6 +229,9 @@ async def main():
         logger.info("Initializing database connection...")
         await init_db()
 
+        # Create the media download directory before the first download
+        await ensure_download_dir()
+
         # Initialize Telegram clients
         logger.info("Initializing Telegram clients...")
         reader, publisher = await init_clients()
@@ -161,57 +240,73 @@ async def main():
         logger.info("Verifying group access...")
         await verify_group_access(reader, publisher)
 
+        # Build the vision chain clients and the image editor SDK before the
+        # first signal arrives
+        await warmup_vision_chain()
+        await asyncio.to_thread(warmup_image_editor)
+
         # Register event handlers
         register_handlers(reader)
 
-        # Start health check
-        create_tracked_task(health_check_loop(), name="health_check")
-
         # Start HTTP health server
         await start_health_server()
 
         logger.info("Bot started, listening for signals...", health_port=config.API_PORT)
 
-        # Run until shutdown
-        done, pending = await asyncio.wait(
-            [
-                asyncio.create_task(reader.run_until_disconnected()),
-                asyncio.create_task(_shutdown_event.wait())
-            ],
-            return_when=asyncio.FIRST_COMPLETED
-        )
+        # Run until shutdown; leaving the group cancels every task in it
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for worker_id in range(config.SIGNAL_WORKERS):
+                    tg.create_task(
+                        signal_worker(_signal_queue, worker_id),
+                        name=f"signal_worker_{worker_id}"
+                    )
+                # Shut down if a Telegram client disconnects permanently
+                tg.create_task(
+                    watch_client_connections(reader, publisher),
+                    name="client_watch"
+                )
+                tg.create_task(_run_reader(reader), name="reader")
+                tg.create_task(_terminate_on_shutdown(), name="shutdown_watch")
+        except* TerminateTaskGroup:
+            pass
 
     except Exception as e:
         logger.error("Fatal error in main", error=str(e))
         raise
     finally:
         logger.info("Initiating graceful shutdown...")
-
-        # Stop health server
         try:
-            await stop_health_server()
-        except Exception as e:
-            logger.warning("Error stopping health server", error=str(e))
+            await asyncio.wait_for(_cleanup(), timeout=SHUTDOWN_TIMEOUT_SEC)
+        except TimeoutError:
+            logger.error("Shutdown timed out, forcing exit",
+                        timeout_sec=SHUTDOWN_TIMEOUT_SEC)
+            os._exit(1)
 
-        # Cancel running tasks
-        for task in list(_running_tasks):
-            task.cancel()
+        logger.info("Shutdown complete")
 
-        if _running_tasks:
-            await asyncio.gather(*_running_tasks, return_exceptions=True)
 
-        # Cleanup
-        try:
-            await disconnect_clients()
-        except Exception as e:
-            logger.warning("Error cleaning up clients", error=str(e))
+async def _cleanup() -> None:
+    """Stop the health server and close Telegram clients, the image editor and the database."""
+    try:
+        await stop_health_server()
+    except Exception as e:
+        logger.warning("Error stopping health server", error=str(e))
 
-        try:
-            await close_db()
-        except Exception as e:
-            logger.warning("Error closing database", error=str(e))
+    try:
+        await disconnect_clients()
+    except Exception as e:
+        logger.warning("Error cleaning up clients", error=str(e))
 
-        logger.info("Shutdown complete")
+    try:
+        await asyncio.to_thread(close_image_editor)
+    except Exception as e:
+        logger.warning("Error closing image editor", error=str(e))
+
+    try:
+        await close_db()
+    except Exception as e:
+        logger.warning("Error closing database", error=str(e))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 """Media handling package."""
 
-from src.media.downloader import cleanup_media, download_and_process_media
+from src.media.downloader import cleanup_media, download_and_process_media, ensure_download_dir
 
-__all__ = ['download_and_process_media', 'cleanup_media']
+__all__ = ['download_and_process_media', 'cleanup_media', 'ensure_download_dir']
@@ -1,7 +1,8 @@
 """Media downloader for Telegram messages."""
 
+import asyncio
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from src.config import config
@@ -9,6 +10,40 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Set once the download directory has been created, so later downloads
+# skip the makedirs syscall entirely
+_download_dir_ready = False
+
+
+async def ensure_download_dir() -> None:
+    """
+    Create the media download directory once, off the event loop.
+
+    Called by main() at startup; later calls only check a module flag.
+    """
+    global _download_dir_ready
+    if not _download_dir_ready:
+        await asyncio.to_thread(os.makedirs, config.MEDIA_DOWNLOAD_DIR, exist_ok=True)
+        _download_dir_ready = True
+
+
+def _expected_media_size(message) -> Optional[int]:
+    """
+    Get the media size Telegram reports for a message, without downloading.
+
+    Uses Telethon's message.file, which covers documents and the largest
+    photo size.
+
+    Args:
+        message: Telegram message object
+
+    Returns:
+        Size in bytes, or None if Telegram did not report one
+    """
+    media_file = getattr(message, 'file', None)
+    size = getattr(media_file, 'size', None)
+    return size if isinstance(size, int) else None
+
 
 async def download_and_process_media(
     client,
@@ -30,7 +65,7 @@ async def download_and_process_media(
             - local_path: Path to downloaded file
             - file_name: Original filename
             - file_size: Size in bytes
-            - downloaded_at: Timestamp
+            - downloaded_at: Timestamp (timezone-aware UTC)
         Or None if no media or download failed
     """
     # Check if message has downloadable media
@@ -38,8 +73,19 @@ async def download_and_process_media(
         logger.debug("No media in message", entity_id=entity_id)
         return None
 
+    max_size = config.MAX_IMAGE_SIZE_MB * 1024 * 1024
+
+    # Reject oversized media from message metadata before downloading it
+    expected_size = _expected_media_size(message)
+    if expected_size is not None and expected_size > max_size:
+        logger.warning("Media too large, skipping download",
+                      entity_id=entity_id,
+                      file_size_mb=expected_size / (1024 * 1024),
+                      max_size_mb=config.MAX_IMAGE_SIZE_MB)
+        return None
+
     # Ensure download directory exists
-    os.makedirs(config.MEDIA_DOWNLOAD_DIR, exist_ok=True)
+    await ensure_download_dir()
 
     try:
         # Download media
@@ -56,23 +102,22 @@ async def download_and_process_media(
             logger.warning("Download returned no path", entity_id=entity_id)
             return None
 
-        # Check file size
-        file_size = os.path.getsize(file_path)
-        max_size = config.MAX_IMAGE_SIZE_MB * 1024 * 1024
+        # Check actual file size (metadata may be missing or inaccurate)
+        file_size = await asyncio.to_thread(os.path.getsize, file_path)
 
         if file_size > max_size:
             logger.warning("Media too large, skipping",
                           entity_id=entity_id,
                           file_size_mb=file_size / (1024 * 1024),
                           max_size_mb=config.MAX_IMAGE_SIZE_MB)
-            os.remove(file_path)
+            await asyncio.to_thread(os.remove, file_path)
             return None
 
         result = {
             'local_path': file_path,
             'file_name': os.path.basename(file_path),
             'file_size': file_size,
-            'downloaded_at': datetime.utcnow()
+            'downloaded_at': datetime.now(timezone.utc)
         }
 
         logger.info("Media downloaded",
@@ -89,16 +134,21 @@ async def download_and_process_media(
         return None
 
 
-def cleanup_media(file_path: str) -> None:
+async def cleanup_media(file_path: str) -> None:
     """
     Remove downloaded media file after processing.
 
+    The unlink runs in a worker thread so it does not block the event loop.
+
     Args:
         file_path: Path to the file to delete
     """
+    if not file_path:
+        return
     try:
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
-            logger.debug("Cleaned up media file", path=file_path)
+        await asyncio.to_thread(os.remove, file_path)
+        logger.debug("Cleaned up media file", path=file_path)
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.warning("Failed to cleanup media", path=file_path, error=str(e))
@@ -1,14 +1,20 @@
 """Gemini Vision OCR for extracting text from trading chart images."""
 
 import asyncio
+import hashlib
 import os
+import re
 import threading
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 import google.generativeai as genai
+from PIL import Image
 
 from src.config import config
 from src.utils.logger import get_logger
+from src.utils.retry import call_with_retry
 from src.utils.security import validate_image_file
 
 logger = get_logger(__name__)
@@ -16,9 +22,49 @@ logger = get_logger(__name__)
 # Configure Gemini
 genai.configure(api_key=config.GEMINI_API_KEY)
 
+# Prompt sent with every OCR request (module constant, built once)
+_OCR_PROMPT = '''Extract ALL visible text from this trading chart/screenshot image.
+If text is visible, translate any Russian text to English.
+Preserve numbers, currency symbols ($, €), and ticker symbols (e.g., BTC/USDT, %) exactly.
+
+If NO readable text is found on the image, return exactly: NO_TEXT_FOUND
+
+Return in this format:
+EXTRACTED: [original text from image]
+TRANSLATED: [english translation if needed, or same as extracted if already English]
+
+If no text found:
+EXTRACTED: (none)
+TRANSLATED: (none)'''
+
+# First "TRANSLATED:" line of the OCR response (value stripped by caller)
+_TRANSLATED_RE = re.compile(r'^TRANSLATED:(.*)$', re.MULTILINE)
+
+# Images larger than this (longest side, px) are downscaled to a JPEG
+# before upload; smaller images are uploaded unchanged
+_OCR_MAX_DIMENSION = 1568
+_OCR_JPEG_QUALITY = 85
+
 _model = None
 _model_lock = threading.Lock()
 
+# Per-image caches keyed by SHA-256 of the file contents, so re-posted or
+# forwarded screenshots skip the upload and the model call. Both are LRU
+# bounded and guarded by _model_lock. Only found text is cached; a "no
+# text" reply is asked again next time.
+_CACHE_MAX_ENTRIES = 128
+_upload_cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+_ocr_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# Gemini deletes uploaded files after 48 hours; cached handles (stored with
+# their time.monotonic() upload time) are replaced well before that
+_UPLOAD_TTL_SEC = 24 * 60 * 60
+
+# In-flight OCR requests keyed by content hash; concurrent callers with the
+# same image await one shared future instead of issuing their own request.
+# Only touched from the event loop, so no lock is needed.
+_inflight_ocr: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+
 
 def get_model() -> genai.GenerativeModel:
     """Get or create Gemini Vision model instance (thread-safe)."""
@@ -30,11 +76,79 @@ def get_model() -> genai.GenerativeModel:
     return _model
 
 
+def _file_digest(image_path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    with open(image_path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def _cache_get(cache: OrderedDict, key: str, default: Any = None) -> Any:
+    """Look up a key in an LRU cache, marking it as recently used."""
+    with _model_lock:
+        if key not in cache:
+            return default
+        cache.move_to_end(key)
+        return cache[key]
+
+
+def _cache_pop(cache: OrderedDict, key: str) -> None:
+    """Remove a key from an LRU cache if present."""
+    with _model_lock:
+        cache.pop(key, None)
+
+
+def _cache_put(cache: OrderedDict, key: str, value: Any) -> None:
+    """Store a value in an LRU cache, evicting the oldest entry if full."""
+    with _model_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > _CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+def _prepare_upload(image_path: str) -> Optional[str]:
+    """
+    Write a downscaled JPEG copy of a large image for upload.
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        str: Path to the temporary downscaled copy (caller deletes it),
+        or None if the image is small enough or cannot be read by PIL
+        and should be uploaded as is
+    """
+    try:
+        img = Image.open(image_path)
+    except Exception as e:
+        logger.debug("Could not open image for downscaling", error=str(e))
+        return None
+
+    with img:
+        if max(img.size) <= _OCR_MAX_DIMENSION:
+            return None
+
+        original_size = img.size
+        img.thumbnail((_OCR_MAX_DIMENSION, _OCR_MAX_DIMENSION))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        upload_path = f"{os.path.splitext(image_path)[0]}_ocr.jpg"
+        img.save(upload_path, "JPEG", quality=_OCR_JPEG_QUALITY)
+
+    logger.debug("Downscaled image for OCR upload",
+                 original_size=original_size,
+                 upload_size=os.path.getsize(upload_path))
+    return upload_path
+
+
 def extract_image_text(image_path: str) -> Optional[str]:
     """
     Extract and translate text from a trading chart image using Gemini Vision.
 
-    This is a SYNCHRONOUS function.
+    This is a SYNCHRONOUS function. Found text and uploaded file handles
+    are cached by image content hash, so duplicate images are not
+    re-processed.
 
     Args:
         image_path: Path to the image file
@@ -53,43 +167,86 @@ def extract_image_text(image_path: str) -> Optional[str]:
     if not os.path.exists(image_path):
         raise FileNotFoundError(f"Image not found: {image_path}")
 
+    digest = _file_digest(image_path)
+    cached = _cache_get(_ocr_cache, digest)
+    if cached is not None:
+        logger.debug("OCR cache hit", image_path=image_path)
+        return cached
+
     logger.debug("Starting OCR", image_path=image_path)
 
-    # Upload file to Gemini
-    uploaded_file = genai.upload_file(image_path)
+    # Upload file to Gemini (reuse a recent handle for identical images)
+    uploaded_file = _get_uploaded_file(digest)
+    if uploaded_file is None:
+        # Large screenshots are sent as a downscaled JPEG copy
+        upload_path = _prepare_upload(image_path)
+        try:
+            uploaded_file = genai.upload_file(upload_path or image_path)
+        finally:
+            if upload_path:
+                os.remove(upload_path)
+        _cache_put(_upload_cache, digest, (uploaded_file, time.monotonic()))
 
-    prompt = '''Extract ALL visible text from this trading chart/screenshot image.
-If text is visible, translate any Russian text to English.
-Preserve numbers, currency symbols ($, €), and ticker symbols (e.g., BTC/USDT, %) exactly.
+    model = get_model()
+    try:
+        # Rate limits and 5xx blips are retried with backoff instead of losing the image
+        response = call_with_retry(
+            lambda: model.generate_content([_OCR_PROMPT, uploaded_file]),
+            attempts=config.MAX_RETRIES,
+            operation="gemini_ocr"
+        )
+    except Exception:
+        # The handle may be expired or deleted; upload afresh next time
+        _cache_pop(_upload_cache, digest)
+        raise
 
-If NO readable text is found on the image, return exactly: NO_TEXT_FOUND
+    text = response.text.strip()
 
-Return in this format:
-EXTRACTED: [original text from image]
-TRANSLATED: [english translation if needed, or same as extracted if already English]
+    result = _parse_ocr_response(text)
+    if result is not None:
+        _cache_put(_ocr_cache, digest, result)
+    return result
 
-If no text found:
-EXTRACTED: (none)
-TRANSLATED: (none)'''
 
-    model = get_model()
-    response = model.generate_content([prompt, uploaded_file])
+def _get_uploaded_file(digest: str) -> Optional[Any]:
+    """
+    Get the cached Gemini file handle for an image if it is still fresh.
 
-    text = response.text.strip()
+    Args:
+        digest: Content hash of the image
+
+    Returns:
+        The uploaded file handle, or None if there is none or it is older
+        than _UPLOAD_TTL_SEC (the stale entry is dropped)
+    """
+    entry = _cache_get(_upload_cache, digest)
+    if entry is None:
+        return None
+
+    uploaded_file, uploaded_at = entry
+    if time.monotonic() - uploaded_at > _UPLOAD_TTL_SEC:
+        _cache_pop(_upload_cache, digest)
+        return None
+    return uploaded_file
+
+
+def _parse_ocr_response(text: str) -> Optional[str]:
+    """
+    Parse the model's EXTRACTED/TRANSLATED response.
 
-    # Parse response
+    Args:
+        text: Stripped response text from Gemini
+
+    Returns:
+        str: Translated text formatted for message, or None if no text found
+    """
     if "NO_TEXT_FOUND" in text or "EXTRACTED: (none)" in text:
         logger.info("No text found in image")
         return None
 
     # Extract translated portion
-    lines = text.split('\n')
-    translated = None
-
-    for line in lines:
-        if line.startswith('TRANSLATED:'):
-            translated = line.replace('TRANSLATED:', '').strip()
-            break
+    match = _TRANSLATED_RE.search(text)
+    translated = match.group(1).strip() if match else None
 
     if translated and translated != '(none)':
         logger.info("OCR complete", text_length=len(translated))
@@ -99,10 +256,20 @@ TRANSLATED: (none)'''
     return None
 
 
+def _validated_digest(image_path: str) -> Optional[str]:
+    """Return the content hash of a safe, existing image, or None."""
+    if not validate_image_file(image_path) or not os.path.exists(image_path):
+        return None
+    return _file_digest(image_path)
+
+
 async def translate_image_ocr(image_path: str) -> Optional[str]:
     """
     Async wrapper for image OCR extraction.
 
+    Concurrent calls for identical images (same content hash) are
+    coalesced into a single Gemini request.
+
     Args:
         image_path: Path to the image file
 
@@ -110,8 +277,32 @@ async def translate_image_ocr(image_path: str) -> Optional[str]:
         str: Extracted text formatted for message, or None
     """
     try:
-        result = await asyncio.to_thread(extract_image_text, image_path)
-        return result
+        digest = await asyncio.to_thread(_validated_digest, image_path)
+        if digest is None:
+            # Let extract_image_text log/raise for invalid or missing paths
+            return await asyncio.to_thread(extract_image_text, image_path)
+
+        pending = _inflight_ocr.get(digest)
+        if pending is not None:
+            logger.debug("Joining in-flight OCR request", path=image_path)
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        _inflight_ocr[digest] = future
+        try:
+            result = await asyncio.to_thread(extract_image_text, image_path)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unjoined future does not log a warning
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            _inflight_ocr.pop(digest, None)
     except FileNotFoundError:
         logger.warning("Image file not found for OCR", path=image_path)
         return None
@@ -7,25 +7,69 @@ Simple two-stage pipeline:
 """
 
 import asyncio
-import concurrent.futures
+import hashlib
 import os
-from typing import Dict, List, Optional
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, Optional, Tuple
 
 from PIL import Image
 
 from src.config import config
+from src.image_editing.base import ImageEditor
 from src.image_editing.factory import ImageEditorFactory
-from src.utils.logger import get_logger
+from src.utils.logger import get_logger, is_debug_enabled
 from src.utils.security import validate_image_file
 from src.vision import FallbackChain
 from src.vision.factory import VisionProviderFactory
 
 logger = get_logger(__name__)
 
+# Longest side (px) of the image sent to the vision chain; the editor
+# stage still uses the original file
+_VISION_MAX_DIMENSION = 1024
+
+# Stage 2 only runs when some extracted text contains Cyrillic; anything
+# else (tickers, numbers, English labels) is already readable
+_CYRILLIC_RE = re.compile("[\u0400-\u04FF]")
+
 # Lazy-loaded vision chain
 _vision_chain = None
 _vision_chain_lock = asyncio.Lock()
 
+# Extracted translations keyed by a hash of the (resized) pixel data, so a
+# re-posted image skips the vision API. Only touched from the bot's single
+# event loop, with no await between a read and its update, so no lock.
+_EXTRACTION_CACHE_MAX_ENTRIES = 1024
+_extraction_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+# In-flight extractions keyed like the cache, joined by concurrent requests
+# for the same pixels
+_inflight_extractions: Dict[str, "asyncio.Task[Dict[str, str]]"] = {}
+
+# Edited outputs keyed by a hash of the source file bytes (plus output
+# extension), so a re-posted image is answered with a file copy instead of
+# a vision call and an edit. Copies live in <MEDIA_DOWNLOAD_DIR>/edit_cache
+# because handlers delete the outputs they send; evicted copies are removed.
+_EDIT_CACHE_MAX_ENTRIES = 64
+_EDIT_CACHE_SUBDIR = "edit_cache"
+_edit_cache: "OrderedDict[str, str]" = OrderedDict()
+_edit_cache_lock = threading.Lock()
+_edit_cache_dir: Optional[str] = None
+
+# Image editor shared by all edits: built once (at startup by
+# warmup_image_editor) and reused, so its SDK client and connection pool
+# persist across images. Closed on shutdown by close_image_editor.
+_editor: Optional[ImageEditor] = None
+_editor_lock = threading.Lock()
+
+# Caps concurrent Stage 2 calls to stay within the editor API's rate limits
+_edit_semaphore: Optional[asyncio.Semaphore] = None
+_edit_semaphore_lock = threading.Lock()
+
 
 async def get_vision_chain() -> Optional[FallbackChain]:
     """Get or create vision provider chain (thread-safe)."""
@@ -63,7 +107,8 @@ async def get_vision_chain() -> Optional[FallbackChain]:
                         _vision_chain = FallbackChain(
                             providers,
                             timeout_sec=config.VISION_TIMEOUT_SEC,
-                            max_retries=config.VISION_MAX_RETRIES
+                            max_retries=config.VISION_MAX_RETRIES,
+                            max_concurrent=config.VISION_MAX_CONCURRENT
                         )
                         logger.info("Vision chain created",
                                   num_providers=len(providers),
@@ -77,97 +122,232 @@ async def get_vision_chain() -> Optional[FallbackChain]:
     return _vision_chain
 
 
-async def extract_text_from_image(image: Image.Image) -> List[Dict[str, str]]:
+def _image_cache_key(image: Image.Image) -> str:
+    """Hash an image's mode, size and pixel bytes into a cache key."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+async def extract_text_from_image(
+    image: Image.Image,
+    cache_key: Optional[str] = None,
+) -> Dict[str, str]:
     """
     Extract and translate text from image using vision chain.
 
+    Non-empty results are cached in memory by pixel hash; failures and
+    empty results are not cached so they are retried next time. Concurrent
+    calls for the same pixels share one in-flight vision request.
+
     Args:
         image: PIL Image object
+        cache_key: Precomputed _image_cache_key(image); hashed in a worker
+            thread when omitted
 
     Returns:
-        List of dicts with 'russian' and 'english' keys
+        Dict mapping original (Russian) text to its English translation
+    """
+    if cache_key is None:
+        cache_key = await asyncio.to_thread(_image_cache_key, image)
+    cached = _extraction_cache.get(cache_key)
+    if cached is not None:
+        _extraction_cache.move_to_end(cache_key)
+        logger.info("Vision extraction cache hit", count=len(cached))
+        return dict(cached)
+
+    pending = _inflight_extractions.get(cache_key)
+    if pending is not None:
+        logger.info("Joining in-flight vision extraction")
+        return dict(await asyncio.shield(pending))
+
+    task = asyncio.create_task(_extract_uncached(image, cache_key))
+    _inflight_extractions[cache_key] = task
+    try:
+        return dict(await asyncio.shield(task))
+    finally:
+        if _inflight_extractions.get(cache_key) is task:
+            del _inflight_extractions[cache_key]
+
+
+async def _extract_uncached(image: Image.Image, cache_key: str) -> Dict[str, str]:
+    """
+    Run the vision chain for an image and cache a non-empty result.
+
+    Args:
+        image: PIL Image object
+        cache_key: Pixel hash of the image from _image_cache_key
+
+    Returns:
+        Dict mapping original text to English (empty on failure)
     """
     chain = await get_vision_chain()
 
     if not chain:
         logger.error("Vision chain not available for text extraction")
-        return []
+        return {}
 
     try:
         logger.info("Extracting text with vision chain")
         result = await chain.extract_text(image)
 
         if result and result.extractions:
-            # Convert VisionResult extractions to expected format
-            translations = [
-                {"russian": extraction.original, "english": extraction.translated}
-                for extraction in result.extractions
-                if extraction.original and extraction.translated
-            ]
+            # Map original -> English in one pass. Repeated labels keep their
+            # first reading; text that is already English needs no edit.
+            translations: Dict[str, str] = {}
+            for extraction in result.extractions:
+                original, english = extraction.original, extraction.translated
+                if original and english and original != english:
+                    translations.setdefault(original, english)
 
             if translations:
                 logger.info("Vision chain extraction successful",
                           count=len(translations),
-                          provider=result.provider_name,
-                          translations=[f"{t['russian']} -> {t['english']}" for t in translations[:5]])
+                          provider=result.provider_name)
+                if is_debug_enabled(__name__):
+                    logger.debug("Vision chain translations",
+                                 translations=[f"{ru} -> {en}" for ru, en in list(translations.items())[:5]])
+                _extraction_cache[cache_key] = translations
+                if len(_extraction_cache) > _EXTRACTION_CACHE_MAX_ENTRIES:
+                    _extraction_cache.popitem(last=False)
                 return translations
             else:
-                logger.warning("Vision chain returned empty extractions")
+                logger.warning("Vision chain returned no text to translate")
         else:
             logger.warning("Vision chain returned no result or extractions")
 
     except Exception as e:
         logger.error("Vision chain extraction failed", error=str(e), error_type=type(e).__name__, exc_info=True)
 
-    return []
+    return {}
 
 
-def _run_async(coro):
-    """
-    Run async coroutine from sync context safely.
+def _get_editor() -> ImageEditor:
+    """Get or create the shared image editor with its client (thread-safe)."""
+    global _editor
 
-    Handles two scenarios:
-    1. If already in async context (event loop running) - creates new loop in thread
-    2. If in sync context - uses asyncio.run()
+    if _editor is None:
+        with _editor_lock:
+            if _editor is None:
+                editor = ImageEditorFactory.get_editor_with_fallback()
+                editor.warmup()
+                _editor = editor
+    return _editor
 
-    Args:
-        coro: Coroutine to execute
 
-    Returns:
-        Result of coroutine execution
+def _get_edit_semaphore() -> asyncio.Semaphore:
+    """Get or create the semaphore limiting concurrent image edits (thread-safe)."""
+    global _edit_semaphore
+
+    if _edit_semaphore is None:
+        with _edit_semaphore_lock:
+            if _edit_semaphore is None:
+                _edit_semaphore = asyncio.Semaphore(config.IMAGE_EDITOR_MAX_CONCURRENT)
+    return _edit_semaphore
+
+
+def warmup_image_editor() -> None:
+    """
+    Warm up the configured image editor at startup.
+
+    Creates the shared editor and its client so the first signal image
+    does not pay the import and initialization cost. Failures are logged
+    and ignored; the editor is created lazily again on first use.
     """
     try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-
-    if loop and loop.is_running():
-        # Already in async context - create new loop in thread to avoid conflict
-        logger.debug("Running coroutine in thread pool (async context detected)")
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            future = pool.submit(asyncio.run, coro)
-            return future.result()
-    else:
-        # Sync context - safe to use asyncio.run()
-        logger.debug("Running coroutine with asyncio.run (sync context)")
-        return asyncio.run(coro)
-
-
-def edit_image_text_sync(image_path: str, output_path: str) -> Optional[str]:
+        editor = _get_editor()
+        logger.info("Image editor warmed up", editor=editor.name)
+    except Exception as e:
+        logger.warning("Image editor warmup failed", error=str(e))
+
+
+def close_image_editor() -> None:
+    """Close the shared image editor and its client (called on shutdown)."""
+    global _editor
+
+    with _editor_lock:
+        editor, _editor = _editor, None
+    if editor is not None:
+        editor.close()
+
+
+async def warmup_vision_chain() -> None:
     """
-    Edit image: translate Russian text to English using vision + image editing.
+    Build the vision chain and its provider clients at startup.
 
-    Stage 1: Vision provider extracts and translates text
-    Stage 2: Image editor generates new image with translations
+    Moves provider construction and client setup off the first signal
+    image. No request is sent, so no API quota is spent.
+    """
+    chain = await get_vision_chain()
+    if chain:
+        await asyncio.to_thread(chain.warmup)
+        logger.info("Vision chain warmed up", providers=chain.available_providers)
+
+
+def _edit_cache_key(image_bytes: bytes, output_path: str) -> str:
+    """Hash source file bytes into an edit cache key for output_path's format."""
+    digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+    return digest + os.path.splitext(output_path)[1].lower()
+
+
+def _copy_cached_edit(cache_key: str, output_path: str) -> bool:
+    """Copy a cached edited image to output_path; return False on a miss."""
+    with _edit_cache_lock:
+        cached_path = _edit_cache.get(cache_key)
+        if cached_path is None:
+            return False
+        try:
+            shutil.copyfile(cached_path, output_path)
+        except OSError as e:
+            logger.warning("Cached edited image unusable", path=cached_path, error=str(e))
+            _edit_cache.pop(cache_key, None)
+            return False
+        _edit_cache.move_to_end(cache_key)
+    return True
+
+
+def _store_cached_edit(cache_key: str, output_path: str) -> None:
+    """Keep a copy of a successful edit, evicting the oldest beyond the limit."""
+    global _edit_cache_dir
+
+    with _edit_cache_lock:
+        try:
+            if _edit_cache_dir is None:
+                # Index is in memory only, so drop copies left by a previous run
+                cache_dir = os.path.join(config.MEDIA_DOWNLOAD_DIR, _EDIT_CACHE_SUBDIR)
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                os.makedirs(cache_dir, exist_ok=True)
+                _edit_cache_dir = cache_dir
+
+            cached_path = os.path.join(_edit_cache_dir, cache_key)
+            shutil.copyfile(output_path, cached_path)
+        except OSError as e:
+            logger.warning("Failed to cache edited image", error=str(e))
+            return
+
+        _edit_cache[cache_key] = cached_path
+        _edit_cache.move_to_end(cache_key)
+        while len(_edit_cache) > _EDIT_CACHE_MAX_ENTRIES:
+            _, evicted_path = _edit_cache.popitem(last=False)
+            try:
+                os.remove(evicted_path)
+            except OSError:
+                pass
+
+
+def _read_source_image(image_path: str, output_path: str) -> Optional[Tuple[bytes, str]]:
+    """
+    Validate and read the source image.
 
     Args:
         image_path: Path to original image
-        output_path: Path to save edited image
+        output_path: Path the edited image will be saved to
 
     Returns:
-        Path to edited image, or None if editing failed
+        Tuple of (file bytes, edit cache key), or None if the file is
+        invalid or unreadable
     """
-    # Validate image
     if not validate_image_file(image_path):
         logger.error("Invalid or unsafe image path", path=image_path)
         return None
@@ -176,83 +356,115 @@ def edit_image_text_sync(image_path: str, output_path: str) -> Optional[str]:
         logger.error("Image file not found", path=image_path)
         return None
 
-    logger.info("Starting image text editing", image_path=image_path)
-
     try:
-        # Load image
-        with Image.open(image_path) as img:
-            image = img.convert('RGB')
-
-            # Upscale small images for better OCR accuracy
-            min_dimension = 1024
-            width, height = image.size
-
-            if width < min_dimension or height < min_dimension:
-                scale = max(min_dimension / width, min_dimension / height)
-                new_size = (int(width * scale), int(height * scale))
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
-                logger.info("Upscaled image for OCR", original=(width, height), new=new_size)
-
-            # Stage 1: Extract translations using vision chain
-            logger.info("Stage 1: Extracting translations with vision chain")
-            translations_list = _run_async(extract_text_from_image(image))
-
-            if not translations_list:
-                logger.warning("No translations extracted from image")
-                return None
-
-            # Convert to dict format: {russian_text: english_text}
-            translations_dict = {
-                t['russian']: t['english']
-                for t in translations_list
-            }
-
-            logger.info("Stage 1 complete",
-                       num_translations=len(translations_dict),
-                       translations=list(translations_dict.items())[:5])
+        with open(image_path, 'rb') as f:
+            image_bytes = f.read()
+    except OSError as e:
+        logger.error("Failed to read image", error=str(e), path=image_path)
+        return None
 
-        # Stage 2: Generate edited image using image editor
-        logger.info("Stage 2: Generating edited image with image editor")
+    return image_bytes, _edit_cache_key(image_bytes, output_path)
 
-        # Get image editor with fallback
-        try:
-            editor = ImageEditorFactory.get_editor_with_fallback()
-            logger.info("Image editor ready", editor=editor.name)
-        except Exception as e:
-            logger.error("Failed to get image editor", error=str(e), exc_info=True)
-            return None
 
-        # Edit image
-        result = editor.edit_image(
-            image_path=image_path,
-            translations=translations_dict,
-            output_path=output_path
-        )
-
-        if result.success and result.edited_image:
-            # Save edited image if not already saved
-            if not os.path.exists(output_path):
-                result.edited_image.save(output_path)
-                logger.info("Edited image saved", output_path=output_path)
-
-            logger.info("Image editing successful",
-                       output_path=output_path,
-                       method=result.method)
-            return output_path
-        else:
-            logger.warning("Image editing failed",
-                         error=result.error,
-                         method=result.method)
-            return None
+def _prepare_vision_image(image_bytes: bytes) -> Tuple[Image.Image, str]:
+    """
+    Decode the source image as RGB, downscaled for the vision request.
 
-    except Exception as e:
-        logger.error("Image editing failed", error=str(e), path=image_path, exc_info=True)
-        return None
+    Runs in a worker thread, so the extraction cache key is computed here
+    too rather than hashing the pixels on the event loop.
+
+    Args:
+        image_bytes: Source file contents
+
+    Returns:
+        Tuple of (RGB image whose longest side is at most
+        _VISION_MAX_DIMENSION, extraction cache key for that image)
+    """
+    with Image.open(BytesIO(image_bytes)) as img:
+        # Cap the longest side for the vision request; upscaling adds
+        # no detail and only inflates payload and vision tokens
+        width, height = img.size
+        longest = max(width, height)
+        new_size = None
+
+        if longest > _VISION_MAX_DIMENSION:
+            scale = _VISION_MAX_DIMENSION / longest
+            new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            # JPEG: let the decoder downscale by 1/2..1/8 in the DCT
+            # (no-op for other formats)
+            img.draft('RGB', new_size)
+
+        image = img.convert('RGB')
+
+    if new_size:
+        # reducing_gap does a fast integer box reduce first, leaving
+        # LANCZOS only the final (< 3x) step
+        image = image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        logger.info("Downscaled image for OCR", original=(width, height), new=new_size)
+
+    return image, _image_cache_key(image)
+
+
+def _run_editor(
+    editor: ImageEditor,
+    image_path: str,
+    translations_dict: Dict[str, str],
+    output_path: str,
+    image_bytes: bytes,
+    edit_cache_key: str
+) -> Optional[str]:
+    """
+    Stage 2: generate the edited image and save it (blocking).
+
+    Args:
+        editor: Shared image editor
+        image_path: Path to original image
+        translations_dict: Mapping of original text to English
+        output_path: Path to save edited image
+        image_bytes: Source file contents
+        edit_cache_key: Key to store a successful result under
+
+    Returns:
+        Path to edited image, or None if editing failed
+    """
+    result = editor.edit_image(
+        image_path=image_path,
+        translations=translations_dict,
+        output_path=output_path,
+        image_bytes=image_bytes
+    )
+
+    if result.success and result.edited_image:
+        # Save edited image if not already saved
+        if not os.path.exists(output_path):
+            result.edited_image.save(output_path)
+            logger.info("Edited image saved", output_path=output_path)
+
+        _store_cached_edit(edit_cache_key, output_path)
+
+        logger.info("Image editing successful",
+                   output_path=output_path,
+                   method=result.method)
+        return output_path
+
+    logger.warning("Image editing failed",
+                 error=result.error,
+                 method=result.method)
+    return None
 
 
 async def edit_image_text(image_path: str, output_path: str) -> Optional[str]:
     """
-    Async wrapper for image text editing.
+    Edit image: translate Russian text to English using vision + image editing.
+
+    Stage 1: Vision provider extracts and translates text
+    Stage 2: Image editor generates new image with translations
+
+    Stage 1 is awaited on the calling loop; only file I/O, decoding and the
+    blocking Stage 2 call run in worker threads, so no thread is held while
+    the vision API responds. Stage 2 reuses one shared editor and client.
+    A file edited before (same bytes) is answered from the edit cache
+    without either stage.
 
     Args:
         image_path: Path to original image
@@ -262,8 +474,58 @@ async def edit_image_text(image_path: str, output_path: str) -> Optional[str]:
         Path to edited image, or None if editing failed
     """
     try:
-        result = await asyncio.to_thread(edit_image_text_sync, image_path, output_path)
-        return result
+        # Read the file once: Stage 1 decodes from memory and Stage 2
+        # sends the same bytes instead of re-reading the file
+        source = await asyncio.to_thread(_read_source_image, image_path, output_path)
+        if source is None:
+            return None
+        image_bytes, edit_cache_key = source
+
+        logger.info("Starting image text editing", image_path=image_path)
+
+        if await asyncio.to_thread(_copy_cached_edit, edit_cache_key, output_path):
+            logger.info("Edited image cache hit", output_path=output_path)
+            return output_path
+    except Exception as e:
+        logger.error("Image editing failed", error=str(e), path=image_path, exc_info=True)
+        return None
+
+    try:
+        image, cache_key = await asyncio.to_thread(_prepare_vision_image, image_bytes)
+
+        # Stage 1: Extract translations using vision chain
+        logger.info("Stage 1: Extracting translations with vision chain")
+        translations_dict = await extract_text_from_image(image, cache_key)
+
+        if not translations_dict:
+            logger.warning("No translations extracted from image")
+            return None
+
+        logger.info("Stage 1 complete", num_translations=len(translations_dict))
+
+        if not any(_CYRILLIC_RE.search(original) for original in translations_dict):
+            logger.info("No Cyrillic text in image, skipping edit")
+            return None
+
+        # Stage 2: Generate edited image using image editor
+        logger.info("Stage 2: Generating edited image with image editor")
+
+        # Shared editor; only the first edit (or one after a failed
+        # warmup) builds it
+        try:
+            editor = await asyncio.to_thread(_get_editor)
+            logger.info("Image editor ready", editor=editor.name)
+        except Exception as e:
+            logger.error("Failed to get image editor", error=str(e), exc_info=True)
+            return None
+
+        # Waiting for a slot holds no thread; only running edits do
+        async with _get_edit_semaphore():
+            return await asyncio.to_thread(
+                _run_editor, editor, image_path, translations_dict,
+                output_path, image_bytes, edit_cache_key
+            )
+
     except Exception as e:
-        logger.error("Async image editing failed", error=str(e), path=image_path, exc_info=True)
+        logger.error("Image editing failed", error=str(e), path=image_path, exc_info=True)
         return None
@@ -4,6 +4,8 @@ Parse trading signals to extract structured fields using regex.
 """
 
 import re
+import string
+from typing import Optional
 
 from src.callers_config import CallersConfig
 
@@ -14,13 +16,49 @@ BENDI_PATTERN = re.compile(
     re.IGNORECASE
 )
 
+# Field patterns, compiled once at import (parse_trading_signal runs for
+# every detected signal)
+
+# Characters of a pair ticker such as BTC/USDT (see _extract_pair)
+PAIR_CHARS = frozenset(string.ascii_uppercase + string.digits)
+
+# Direction: LONG/SHORT (English) or ЛОНГ/ШОРТ (Russian)
+DIRECTION_PATTERN = re.compile(r'\b(LONG|SHORT|ЛОНГ|ШОРТ)\b', re.IGNORECASE)
+
+# Uppercased Russian directions normalized to English
+DIRECTION_MAP = {'ЛОНГ': 'LONG', 'ШОРТ': 'SHORT'}
+
+# Timeframe: 15M, 5M, 1H, 4H, D, W (both English M and Russian М)
+TIMEFRAME_PATTERN = re.compile(r'\b(\d+\s*[MМmм]|\d+\s*[Hh]|[Dd]|[Ww])\b')
+
+# Entry range: "Вход: 0.4852 - 0.4922" or "Вход: 0.4852-0.4922"
+ENTRY_PATTERN = re.compile(r'[Вв]ход[а]?:?\s*(\d+\.?\d*)\s*[-–]\s*(\d+\.?\d*)')
+
+# Take profits: "TP1: 100000", "Тейк 1: 0.4773", "Тейк1: 0.4773"
+TP1_PATTERN = re.compile(r'(?:TP\s*1|Тейк\s*1):?\s*\$?(\d+\.?\d*)', re.IGNORECASE)
+TP2_PATTERN = re.compile(r'(?:TP\s*2|Тейк\s*2):?\s*\$?(\d+\.?\d*)', re.IGNORECASE)
+TP3_PATTERN = re.compile(r'(?:TP\s*3|Тейк\s*3):?\s*\$?(\d+\.?\d*)', re.IGNORECASE)
+
+# Stop loss: "SL: 90000" or "Стоп: 0.4997"
+SL_PATTERN = re.compile(r'(?:SL|Стоп):?\s*\$?(\d+\.?\d*)', re.IGNORECASE)
+
+# Risk: "Риск: 2%" or "риск: 2"
+RISK_PATTERN = re.compile(r'[Рр]иск:?\s*(\d+\.?\d*)%?')
+
+# Keywords the take-profit and stop-loss patterns cannot match without,
+# checked against the uppercased text (the patterns are case-insensitive)
+TP_KEYWORDS = ('TP', 'ТЕЙК')
+SL_KEYWORDS = ('SL', 'СТОП')
+
 
 def is_signal(text: str, user_id: int | None = None) -> bool:
     """
     Check if text contains signal marker (case-insensitive).
 
     Uses CallersConfig to get caller-specific detection patterns.
-    Falls back to hashtag pattern if user_id is None.
+    Falls back to hashtag pattern if user_id is None. Patterns with a
+    required literal (e.g. '#' for hashtags) are skipped without running
+    the regex when the literal is absent.
 
     Args:
         text: Message text to check
@@ -33,9 +71,10 @@ def is_signal(text: str, user_id: int | None = None) -> bool:
         return False
 
     config = CallersConfig.get_instance()
-    patterns = config.get_detection_patterns(user_id)
 
-    for pattern in patterns:
+    for literal, pattern in config.get_detection_rules(user_id):
+        if literal and literal not in text:
+            continue
         if pattern.search(text):
             return True
     return False
@@ -104,18 +143,14 @@ def parse_trading_signal(text: str, user_id: int | None = None) -> dict:
             if direction_match:
                 direction = direction_match.group(1).upper()
                 # Normalize Russian to English
-                if direction in ('ЛОНГ', 'лонг'):
-                    direction = 'LONG'
-                elif direction in ('ШОРТ', 'шорт'):
-                    direction = 'SHORT'
-                fields['direction'] = direction
+                fields['direction'] = DIRECTION_MAP.get(direction, direction)
 
     # Fall back to existing extraction logic if no match
     if 'pair' not in fields:
         # Extract Pair: BTC/USDT, XION/USDT, YBU/USDT, etc.
-        pair_match = re.search(r'\b([A-Z][A-Z0-9]*\/[A-Z][A-Z0-9]*)\b', text)
-        if pair_match:
-            fields['pair'] = pair_match.group(1)
+        pair = _extract_pair(text)
+        if pair:
+            fields['pair'] = pair
         else:
             # Try Bendi format: **TICKER 🟢LONG** - extract just the ticker
             bendi_match = BENDI_PATTERN.search(text)
@@ -124,20 +159,16 @@ def parse_trading_signal(text: str, user_id: int | None = None) -> dict:
     if 'direction' not in fields:
         # Extract Direction: LONG/SHORT (English) or ЛОНГ/ШОРТ (Russian)
         # Normalize to uppercase English
-        direction_match = re.search(r'\b(LONG|SHORT|ЛОНГ|ШОРТ)\b', text, re.IGNORECASE)
+        direction_match = DIRECTION_PATTERN.search(text)
         if direction_match:
             direction = direction_match.group(1).upper()
             # Normalize Russian to English
-            if direction in ('ЛОНГ', 'лонг'):
-                direction = 'LONG'
-            elif direction in ('ШОРТ', 'шорт'):
-                direction = 'SHORT'
-            fields['direction'] = direction
+            fields['direction'] = DIRECTION_MAP.get(direction, direction)
         else:
             fields['direction'] = None
 
     # Extract Timeframe: 15M, 5M, 1H, 4H, D, W (both English M and Russian М)
-    timeframe_match = re.search(r'\b(\d+\s*[MМmм]|\d+\s*[Hh]|[Dd]|[Ww])\b', text)
+    timeframe_match = TIMEFRAME_PATTERN.search(text)
     if timeframe_match:
         tf = timeframe_match.group(1).strip().upper()
         # Normalize Russian М to English M
@@ -146,36 +177,81 @@ def parse_trading_signal(text: str, user_id: int | None = None) -> dict:
     else:
         fields['timeframe'] = None
 
+    # Keyword-anchored fields below only run their regex when the keyword
+    # is present; most signals omit some of them
+    text_upper = text.upper()
+    has_tp = any(keyword in text_upper for keyword in TP_KEYWORDS)
+
     # Extract Entry Range: Вход: 0.4852 - 0.4922 or Вход: 0.4852-0.4922
-    entry_match = re.search(r'[Вв]ход[а]?:?\s*(\d+\.?\d*)\s*[-–]\s*(\d+\.?\d*)', text)
+    entry_match = ENTRY_PATTERN.search(text) if 'ход' in text else None
     if entry_match:
         fields['entry_range'] = f"{entry_match.group(1)}-{entry_match.group(2)}"
     else:
         fields['entry_range'] = None
 
     # Extract TP1: "TP1: 100000" or "Тейк 1: 0.4773" or "Тейк1: 0.4773"
-    tp1_match = re.search(r'(?:TP\s*1|Тейк\s*1):?\s*\$?(\d+\.?\d*)', text, re.IGNORECASE)
+    tp1_match = TP1_PATTERN.search(text) if has_tp else None
     fields['tp1'] = float(tp1_match.group(1)) if tp1_match else None
 
     # Extract TP2: "TP2: 105000" or "Тейк 2: 0.4658"
-    tp2_match = re.search(r'(?:TP\s*2|Тейк\s*2):?\s*\$?(\d+\.?\d*)', text, re.IGNORECASE)
+    tp2_match = TP2_PATTERN.search(text) if has_tp else None
     fields['tp2'] = float(tp2_match.group(1)) if tp2_match else None
 
     # Extract TP3: "TP3: 110000" or "Тейк 3: 0.12761"
-    tp3_match = re.search(r'(?:TP\s*3|Тейк\s*3):?\s*\$?(\d+\.?\d*)', text, re.IGNORECASE)
+    tp3_match = TP3_PATTERN.search(text) if has_tp else None
     fields['tp3'] = float(tp3_match.group(1)) if tp3_match else None
 
     # Extract SL: "SL: 90000" or "Стоп: 0.4997"
-    sl_match = re.search(r'(?:SL|Стоп):?\s*\$?(\d+\.?\d*)', text, re.IGNORECASE)
+    has_sl = any(keyword in text_upper for keyword in SL_KEYWORDS)
+    sl_match = SL_PATTERN.search(text) if has_sl else None
     fields['sl'] = float(sl_match.group(1)) if sl_match else None
 
     # Extract Risk: "Риск: 2%" or "риск: 2"
-    risk_match = re.search(r'[Рр]иск:?\s*(\d+\.?\d*)%?', text)
+    risk_match = RISK_PATTERN.search(text) if 'иск' in text else None
     fields['risk_percent'] = float(risk_match.group(1)) if risk_match else None
 
     return fields
 
 
+def _extract_pair(text: str) -> Optional[str]:
+    """
+    Find the first trading pair such as BTC/USDT in text.
+
+    Equivalent to searching r'\\b([A-Z][A-Z0-9]*\\/[A-Z][A-Z0-9]*)\\b', but
+    jumps between '/' characters with str.find instead of trying the regex
+    at every position of a long message.
+
+    Args:
+        text: Signal message text
+
+    Returns:
+        The pair (e.g. "BTC/USDT"), or None if there is none
+    """
+    slash = text.find('/')
+    while slash != -1:
+        start = slash
+        while start > 0 and text[start - 1] in PAIR_CHARS:
+            start -= 1
+        end = slash + 1
+        while end < len(text) and text[end] in PAIR_CHARS:
+            end += 1
+
+        # Both tickers start with a letter and are not part of a longer word
+        if (start < slash and text[start].isalpha()
+                and (start == 0 or not _is_word_char(text[start - 1]))
+                and end > slash + 1 and text[slash + 1].isalpha()
+                and (end == len(text) or not _is_word_char(text[end]))):
+            return text[start:end]
+
+        slash = text.find('/', end)
+    return None
+
+
+def _is_word_char(char: str) -> bool:
+    """Check if char is a regex word character (\\w)."""
+    return char.isalnum() or char == '_'
+
+
 def _empty_signal_dict() -> dict:
     """
     Return an empty signal dictionary with all fields set to None.
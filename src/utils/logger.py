@@ -80,7 +80,8 @@ def setup_logging(log_level: str = "INFO", environment: str = "production") -> N
         level=getattr(logging, log_level.upper(), logging.INFO),
     )
 
-    # Common processors
+    # Common processors. structlog's own events are first passed through
+    # filter_by_level, so disabled levels skip masking and formatting.
     shared_processors = [
         structlog.contextvars.merge_contextvars,
         mask_sensitive_data,
@@ -95,7 +96,7 @@ def setup_logging(log_level: str = "INFO", environment: str = "production") -> N
     if environment == "development":
         # Pretty console output for development
         structlog.configure(
-            processors=shared_processors + [
+            processors=[structlog.stdlib.filter_by_level] + shared_processors + [
                 structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
             ],
             logger_factory=structlog.stdlib.LoggerFactory(),
@@ -113,7 +114,7 @@ def setup_logging(log_level: str = "INFO", environment: str = "production") -> N
     else:
         # JSON output for production
         structlog.configure(
-            processors=shared_processors + [
+            processors=[structlog.stdlib.filter_by_level] + shared_processors + [
                 structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
             ],
             logger_factory=structlog.stdlib.LoggerFactory(),
@@ -165,3 +166,18 @@ def get_logger(name: str) -> structlog.stdlib.BoundLogger:
         Configured structlog BoundLogger instance
     """
     return structlog.get_logger(name)
+
+
+def is_debug_enabled(name: str) -> bool:
+    """
+    Check whether DEBUG records of the named logger would be emitted.
+
+    Use it to skip building expensive debug-only log fields.
+
+    Args:
+        name: Logger name, typically __name__
+
+    Returns:
+        True if the logger is enabled for DEBUG
+    """
+    return logging.getLogger(name).isEnabledFor(logging.DEBUG)
@@ -0,0 +1,111 @@
+"""Retry helpers for transient API errors (rate limits, 5xx, timeouts)."""
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Capped exponential backoff with full jitter: attempt n sleeps for a random
+# time in [0, min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * 2**n)]
+BACKOFF_BASE_SEC = 0.5
+BACKOFF_MAX_SEC = 8.0
+
+# HTTP statuses worth retrying: timeout, rate limit and server errors
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Exception class names of the SDKs in use (google-api-core, openai,
+# anthropic) that signal a transient failure; matched by name so none of the
+# SDKs has to be imported here
+_TRANSIENT_ERROR_NAMES = frozenset({
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "TooManyRequests",
+    "RateLimitError",
+    "APIConnectionError",
+    "APITimeoutError",
+    "OverloadedError",
+})
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check whether an error is a transient API failure worth retrying.
+
+    The exception and its causes are inspected, so provider errors that wrap
+    the SDK exception (``raise ... from e``) are classified by the original.
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        True for timeouts, connection errors, rate limits and 5xx responses
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+
+        if isinstance(current, (TimeoutError, ConnectionError)):
+            return True
+        if type(current).__name__ in _TRANSIENT_ERROR_NAMES:
+            return True
+        for attr in ("status_code", "code"):
+            status = getattr(current, attr, None)
+            if isinstance(status, int) and status in TRANSIENT_STATUS_CODES:
+                return True
+
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Get the sleep time before retry number ``attempt + 1``.
+
+    Args:
+        attempt: Zero-based index of the attempt that just failed
+
+    Returns:
+        Delay in seconds (full jitter, capped at BACKOFF_MAX_SEC)
+    """
+    return random.uniform(0, min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * 2 ** attempt))
+
+
+def call_with_retry(func: Callable[[], T], attempts: int = 3, operation: str = "api_call") -> T:
+    """
+    Call a blocking function, retrying transient errors with backoff.
+
+    Args:
+        func: Zero-argument callable to run
+        attempts: Total number of attempts (first call included)
+        operation: Name used in retry log messages
+
+    Returns:
+        The value returned by func
+
+    Raises:
+        Exception: The last error, or the first non-transient one
+    """
+    for attempt in range(attempts):
+        try:
+            return func()
+        except Exception as e:
+            if attempt + 1 >= attempts or not is_transient_error(e):
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(
+                "Transient error, retrying",
+                operation=operation,
+                attempt=attempt + 1,
+                delay_sec=round(delay, 2),
+                error=str(e),
+                error_type=type(e).__name__
+            )
+            time.sleep(delay)
+    raise RuntimeError("call_with_retry needs at least one attempt")
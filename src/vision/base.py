@@ -7,9 +7,12 @@ the VisionProvider abstract base class.
 """
 
 import asyncio
+import base64
+import re
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from io import BytesIO
 from typing import List, Optional
 
 from PIL import Image
@@ -98,6 +101,80 @@ class VisionResult:
         return sum(ext.confidence for ext in self.extractions) / len(self.extractions)
 
 
+# ============================================================================
+# Image Encoding
+# ============================================================================
+
+# JPEG quality for images sent to vision APIs; screenshots stay legible
+# for OCR at a fraction of the PNG payload
+VISION_JPEG_QUALITY = 85
+
+
+def image_to_data_url(image: Image.Image) -> str:
+    """
+    Encode a PIL Image as a base64 data URL for a vision API request.
+
+    Images without an alpha channel are sent as JPEG; images with alpha
+    (RGBA, LA, P with transparency) fall back to lossless PNG.
+
+    Args:
+        image: PIL Image object to encode
+
+    Returns:
+        str: data:image/...;base64,... URL
+    """
+    buffer = BytesIO()
+    has_alpha = image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    if has_alpha:
+        image.save(buffer, format="PNG")
+        mime_type = "image/png"
+    else:
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.save(buffer, format="JPEG", quality=VISION_JPEG_QUALITY)
+        mime_type = "image/jpeg"
+
+    encoded = base64.b64encode(buffer.getbuffer()).decode("ascii")
+    return f"data:{mime_type};base64,{encoded}"
+
+
+# ============================================================================
+# Response Parsing
+# ============================================================================
+
+# One "ORIGINAL: <text> -> ENGLISH: <translation>" entry per line. The first
+# arrow (ASCII or Unicode) separates the parts; "ENGLISH:" is optional and
+# [ \t] keeps matches from running across lines.
+_EXTRACTION_LINE_RE = re.compile(
+    r'ORIGINAL:[ \t]*(?P<original>[^\n]*?)[ \t]*(?:->|→|➔|⟶)'
+    r'[ \t]*(?:ENGLISH:)?(?P<translated>[^\n]*)'
+)
+
+
+def parse_extraction_lines(raw_text: str) -> List[TextExtraction]:
+    """
+    Parse "ORIGINAL: ... -> ENGLISH: ..." lines from a vision response.
+
+    Args:
+        raw_text: Raw text response from a vision provider
+
+    Returns:
+        List[TextExtraction]: Extractions with both original and translated
+        text; incomplete lines are skipped
+    """
+    extractions = []
+    for match in _EXTRACTION_LINE_RE.finditer(raw_text):
+        original = match['original'].strip()
+        translated = match['translated'].strip()
+        if original and translated:
+            extractions.append(
+                TextExtraction(original=original, translated=translated, confidence=1.0)
+            )
+    return extractions
+
+
 # ============================================================================
 # Exceptions
 # ============================================================================
@@ -185,6 +262,14 @@ class VisionProvider(ABC):
         """
         pass
 
+    def warmup(self) -> None:
+        """
+        Build the provider's model client ahead of the first request.
+
+        Default implementation does nothing; providers with lazy clients override it.
+        """
+        pass
+
     def extract_text_sync(
         self,
         image: Image.Image,
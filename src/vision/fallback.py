@@ -7,6 +7,7 @@ from typing import List, Optional
 from PIL import Image
 
 from src.utils.logger import get_logger
+from src.utils.retry import backoff_delay, is_transient_error
 from src.vision.base import VisionProvider, VisionProviderError, VisionResult
 
 logger = get_logger(__name__)
@@ -19,7 +20,8 @@ class FallbackChain:
         self,
         providers: List[VisionProvider],
         timeout_sec: float = 30.0,
-        max_retries: int = 1
+        max_retries: int = 1,
+        max_concurrent: int = 4
     ):
         """
         Initialize FallbackChain.
@@ -27,10 +29,13 @@ class FallbackChain:
         Args:
             providers: List of vision providers to try in order
             timeout_sec: Timeout for each provider attempt
-            max_retries: Max retries per provider before trying next
+            max_retries: Max retries per provider on transient errors
+                before trying next
+            max_concurrent: Max provider calls in flight at once
         """
         self.timeout_sec = timeout_sec
         self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrent)
 
         # Filter to only available providers
         self._providers = [p for p in providers if p.is_available]
@@ -50,6 +55,18 @@ class FallbackChain:
         """Return names of available providers."""
         return [p.name for p in self._providers]
 
+    def warmup(self) -> None:
+        """
+        Build every provider's client so the first image skips client setup.
+
+        Failures are logged and ignored; providers retry lazily on first use.
+        """
+        for provider in self._providers:
+            try:
+                provider.warmup()
+            except Exception as e:
+                logger.warning("Vision provider warmup failed", provider=provider.name, error=str(e))
+
     async def extract_text(
         self,
         image: Image.Image,
@@ -58,6 +75,10 @@ class FallbackChain:
         """
         Try providers in order until one succeeds.
 
+        Transient errors (timeouts, rate limits, 5xx) are retried on the same
+        provider with jittered exponential backoff; other errors move straight
+        on to the next provider.
+
         Args:
             image: PIL Image to process
             prompt: Optional custom prompt
@@ -72,6 +93,16 @@ class FallbackChain:
 
         for provider in self._providers:
             for attempt in range(self.max_retries + 1):
+                if attempt:
+                    delay = backoff_delay(attempt - 1)
+                    logger.info(
+                        "Backing off before retry",
+                        provider=provider.name,
+                        attempt=attempt + 1,
+                        delay_sec=round(delay, 2)
+                    )
+                    await asyncio.sleep(delay)
+
                 try:
                     logger.info(
                         "Trying vision provider",
@@ -80,10 +111,11 @@ class FallbackChain:
                         max_retries=self.max_retries + 1
                     )
 
-                    result = await asyncio.wait_for(
-                        provider.extract_text(image, prompt),
-                        timeout=self.timeout_sec
-                    )
+                    async with self._semaphore:
+                        result = await asyncio.wait_for(
+                            provider.extract_text(image, prompt),
+                            timeout=self.timeout_sec
+                        )
 
                     logger.info(
                         "Vision extraction successful",
@@ -112,6 +144,8 @@ class FallbackChain:
                         error_type=type(e).__name__
                     )
                     last_error = e
+                    if not is_transient_error(e):
+                        break
 
         # All providers failed
         logger.error(
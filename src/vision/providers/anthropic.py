@@ -6,8 +6,6 @@ text from trading chart images.
 """
 
 import asyncio
-import base64
-import io
 import threading
 import time
 from typing import List, Optional
@@ -23,6 +21,8 @@ from src.vision.base import (
     VisionProvider,
     VisionProviderError,
     VisionResult,
+    image_to_data_url,
+    parse_extraction_lines,
 )
 from src.vision.prompts import OCR_EXTRACTION_PROMPT
 
@@ -80,20 +80,9 @@ class AnthropicVisionProvider(VisionProvider):
         """Check if Anthropic API key is configured."""
         return bool(config.ANTHROPIC_API_KEY)
 
-    def _image_to_base64(self, image: Image.Image) -> str:
-        """
-        Convert PIL Image to base64 string for API submission.
-
-        Args:
-            image: PIL Image object
-
-        Returns:
-            Base64 encoded image string
-        """
-        buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        img_bytes = buffered.getvalue()
-        return base64.b64encode(img_bytes).decode("utf-8")
+    def warmup(self) -> None:
+        """Create the shared Anthropic client ahead of the first request."""
+        _get_client()
 
     def _parse_response(self, response_text: str) -> List[TextExtraction]:
         """
@@ -108,50 +97,12 @@ class AnthropicVisionProvider(VisionProvider):
         Returns:
             List of TextExtraction objects
         """
-        extractions = []
-
         # Check for "no text found" indicator
         if "NO_TEXT_FOUND" in response_text:
             logger.info("No text found in image (Anthropic)")
             return []
 
-        # Parse line by line
-        for line in response_text.strip().split("\n"):
-            line = line.strip()
-            if not line or line.startswith("#") or line.startswith("//"):
-                continue
-
-            # Expected format: ORIGINAL: text -> ENGLISH: translation
-            # Also handle Unicode arrow → (U+2192) that AI models sometimes use
-            if "ORIGINAL:" in line and "ENGLISH:" in line:
-                try:
-                    # Normalize Unicode arrows to ASCII
-                    normalized_line = line.replace("→", "->").replace("➔", "->").replace("⟶", "->")
-                    # Split by arrow
-                    parts = normalized_line.split("->")
-                    if len(parts) == 2:
-                        original_part = parts[0].strip()
-                        english_part = parts[1].strip()
-
-                        # Extract text after colons
-                        original = original_part.replace("ORIGINAL:", "").strip()
-                        translated = english_part.replace("ENGLISH:", "").strip()
-
-                        if original and translated:
-                            extractions.append(
-                                TextExtraction(
-                                    original=original,
-                                    translated=translated,
-                                    confidence=1.0
-                                )
-                            )
-                except Exception as e:
-                    logger.warning(
-                        "Failed to parse extraction line",
-                        line=line,
-                        error=str(e)
-                    )
-                    continue
+        extractions = parse_extraction_lines(response_text)
 
         if not extractions:
             logger.warning(
@@ -194,7 +145,7 @@ class AnthropicVisionProvider(VisionProvider):
 
             # Convert image to base64
             logger.debug("Converting image to base64", provider=self.name)
-            image_b64 = self._image_to_base64(image)
+            image_url = image_to_data_url(image)
 
             # Create message with image
             message = HumanMessage(
@@ -202,7 +153,7 @@ class AnthropicVisionProvider(VisionProvider):
                     {"type": "text", "text": extraction_prompt},
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{image_b64}"},
+                        "image_url": {"url": image_url},
                     },
                 ]
             )
@@ -6,10 +6,8 @@ using LangChain's unified interface. The provider uses gemini-2.5-flash for
 vision capabilities with structured text extraction and translation.
 """
 
-import base64
 import threading
 import time
-from io import BytesIO
 from typing import List, Optional
 
 from langchain_core.messages import HumanMessage
@@ -18,7 +16,14 @@ from PIL import Image
 
 from src.config import config
 from src.utils.logger import get_logger
-from src.vision.base import TextExtraction, VisionProvider, VisionProviderError, VisionResult
+from src.vision.base import (
+    TextExtraction,
+    VisionProvider,
+    VisionProviderError,
+    VisionResult,
+    image_to_data_url,
+    parse_extraction_lines,
+)
 from src.vision.prompts import OCR_EXTRACTION_PROMPT
 
 logger = get_logger(__name__)
@@ -107,40 +112,10 @@ class GeminiVisionProvider(VisionProvider):
                         ) from e
         return self._model
 
-    def _image_to_base64(self, image: Image.Image) -> str:
-        """
-        Convert PIL Image to base64-encoded JPEG string.
-
-        Args:
-            image: PIL Image object to convert
-
-        Returns:
-            str: Base64-encoded JPEG image string
-
-        Raises:
-            VisionProviderError: If image conversion fails
-        """
-        try:
-            buffer = BytesIO()
-            image.save(buffer, format="JPEG", quality=95)
-            base64_str = base64.b64encode(buffer.getvalue()).decode()
-            logger.debug(
-                "Image converted to base64",
-                provider=self.name,
-                size_bytes=len(buffer.getvalue()),
-                base64_length=len(base64_str)
-            )
-            return base64_str
-        except Exception as e:
-            logger.error(
-                "Failed to convert image to base64",
-                provider=self.name,
-                error=str(e)
-            )
-            raise VisionProviderError(
-                f"Failed to convert image to base64: {str(e)}",
-                provider=self.name
-            ) from e
+    def warmup(self) -> None:
+        """Create the Gemini model client ahead of the first request."""
+        if config.GEMINI_API_KEY:
+            self._get_model()
 
     def _parse_response(self, raw_text: str) -> List[TextExtraction]:
         """
@@ -155,8 +130,6 @@ class GeminiVisionProvider(VisionProvider):
         Returns:
             List[TextExtraction]: Parsed text extractions with translations
         """
-        extractions = []
-
         logger.debug(
             "Parsing vision response",
             provider=self.name,
@@ -169,64 +142,9 @@ class GeminiVisionProvider(VisionProvider):
                 "No text found in image",
                 provider=self.name
             )
-            return extractions
-
-        for line_num, line in enumerate(raw_text.split('\n'), 1):
-            line = line.strip()
-
-            # Skip empty lines
-            if not line:
-                continue
-
-            # Normalize Unicode arrows to ASCII for consistent parsing
-            normalized_line = line.replace("→", "->").replace("➔", "->").replace("⟶", "->")
-
-            # Skip lines without the arrow separator
-            if '->' not in normalized_line:
-                continue
-
-            # Format: "ORIGINAL: text -> ENGLISH: translation"
-            if 'ORIGINAL:' in normalized_line and 'ENGLISH:' in normalized_line:
-                try:
-                    parts = normalized_line.split('->', 1)  # Split only on first arrow
-                    if len(parts) != 2:
-                        continue
-
-                    original = parts[0].replace('ORIGINAL:', '').strip()
-                    english = parts[1].replace('ENGLISH:', '').strip()
-
-                    # Only add if we have both original and english text
-                    if original and english:
-                        extractions.append(
-                            TextExtraction(
-                                original=original,
-                                translated=english,
-                                confidence=1.0
-                            )
-                        )
-                        logger.debug(
-                            "Parsed text extraction",
-                            provider=self.name,
-                            line_num=line_num,
-                            original=original[:50],  # Log first 50 chars
-                            translated=english[:50]
-                        )
-                    else:
-                        logger.warning(
-                            "Skipping extraction with empty text",
-                            provider=self.name,
-                            line_num=line_num,
-                            line=line[:100]
-                        )
-                except Exception as e:
-                    logger.warning(
-                        "Failed to parse extraction line",
-                        provider=self.name,
-                        line_num=line_num,
-                        line=line[:100],
-                        error=str(e)
-                    )
-                    continue
+            return []
+
+        extractions = parse_extraction_lines(raw_text)
 
         logger.info(
             "Response parsing complete",
@@ -245,7 +163,7 @@ class GeminiVisionProvider(VisionProvider):
         Extract and translate text from an image using Gemini vision API.
 
         This method:
-        1. Converts PIL Image to base64 JPEG
+        1. Encodes PIL Image as a base64 JPEG data URL
         2. Creates HumanMessage with text prompt and image
         3. Invokes Gemini model asynchronously
         4. Parses response into structured TextExtraction objects
@@ -280,8 +198,8 @@ class GeminiVisionProvider(VisionProvider):
             # Get model instance
             model = self._get_model()
 
-            # Convert image to base64
-            base64_image = self._image_to_base64(image)
+            # Encode image as a JPEG data URL
+            image_url = image_to_data_url(image)
 
             # Create HumanMessage with text and image content
             message = HumanMessage(
@@ -289,7 +207,7 @@ class GeminiVisionProvider(VisionProvider):
                     {"type": "text", "text": prompt or OCR_EXTRACTION_PROMPT},
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}
+                        "image_url": {"url": image_url}
                     }
                 ]
             )
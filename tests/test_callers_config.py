@@ -139,6 +139,56 @@ class TestGetDetectionPatterns:
             assert len(patterns) > 0, f"No patterns for user_id={user_id}"
 
 
+class TestGetDetectionRules:
+    """Tests for get_detection_rules method."""
+
+    def setup_method(self):
+        """Reset singleton before each test."""
+        CallersConfig.reset()
+
+    def test_detection_rules_hashtag_literal(self):
+        """Test hashtag rules carry the '#' literal pre-filter."""
+        config = CallersConfig.get_instance()
+        rules = config.get_detection_rules(1018248833)
+
+        assert len(rules) == 1
+        literal, pattern = rules[0]
+        assert literal == '#'
+        assert isinstance(pattern, re.Pattern)
+
+    def test_detection_rules_fallback_literals(self):
+        """Test fallback rules cover hashtag and bendi literals."""
+        config = CallersConfig.get_instance()
+        rules = config.get_detection_rules(None)
+
+        assert [literal for literal, _ in rules] == ['#', '**']
+
+    def test_detection_rules_without_literal(self):
+        """Test patterns without a literal key have no pre-filter."""
+        config = CallersConfig.get_instance()
+        rules = config.get_detection_rules(740952897)
+
+        assert len(rules) == 1
+        assert rules[0][0] is None
+
+    def test_detection_rules_match_detection_patterns(self):
+        """Test rules expose the same compiled patterns as get_detection_patterns."""
+        config = CallersConfig.get_instance()
+
+        for user_id in [1018248833, 468446980, 740952897, 5575681795, None]:
+            rules = config.get_detection_rules(user_id)
+            patterns = config.get_detection_patterns(user_id)
+            assert [p for _, p in rules] == patterns
+
+    def test_detection_rules_cached_per_caller(self):
+        """Test rules are built once per caller and unknown users share the fallback."""
+        config = CallersConfig.get_instance()
+
+        assert config.get_detection_rules(1018248833) is config.get_detection_rules(1018248833)
+        assert config.get_detection_rules(123) is config.get_detection_rules(None)
+        assert set(config._detection_rules) == {1018248833, None}
+
+
 class TestGetExtractionPatterns:
     """Tests for get_extraction_patterns method."""
 
@@ -0,0 +1,90 @@
+"""Tests for media downloader - size checks and cleanup."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.media import downloader
+from src.media.downloader import cleanup_media, download_and_process_media
+
+
+@pytest.fixture
+def media_dir(tmp_path):
+    """Point MEDIA_DOWNLOAD_DIR at a temp dir and reset the created flag."""
+    target = tmp_path / "media"
+    with patch.object(downloader.config, "MEDIA_DOWNLOAD_DIR", str(target)), \
+            patch.object(downloader, "_download_dir_ready", False):
+        yield target
+
+
+def _message_writing(path, data):
+    """Create a mock message whose download_media writes data to path."""
+    async def download_media(file):
+        path.write_bytes(data)
+        return str(path)
+
+    message = MagicMock()
+    message.photo = MagicMock()
+    message.document = None
+    message.file.size = None
+    message.download_media = AsyncMock(side_effect=download_media)
+    return message
+
+
+class TestDownloadAndProcessMedia:
+    """Tests for download_and_process_media."""
+
+    @pytest.mark.asyncio
+    async def test_creates_dir_and_returns_info(self, media_dir):
+        """Test the download dir is created and file info returned."""
+        message = _message_writing(media_dir / "photo.jpg", b"x" * 10)
+
+        result = await download_and_process_media(None, message, entity_id=1)
+
+        assert media_dir.is_dir()
+        assert result['file_name'] == "photo.jpg"
+        assert result['file_size'] == 10
+
+    @pytest.mark.asyncio
+    async def test_oversized_file_removed(self, media_dir):
+        """Test files over MAX_IMAGE_SIZE_MB are deleted and skipped."""
+        path = media_dir / "big.jpg"
+        message = _message_writing(path, b"x" * 10)
+
+        with patch.object(downloader.config, "MAX_IMAGE_SIZE_MB", 0):
+            result = await download_and_process_media(None, message, entity_id=1)
+
+        assert result is None
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_oversized_metadata_skips_download(self, media_dir):
+        """Test media reported as too large by Telegram is never downloaded."""
+        message = _message_writing(media_dir / "big.jpg", b"x")
+        message.file.size = 10 * 1024 * 1024
+
+        with patch.object(downloader.config, "MAX_IMAGE_SIZE_MB", 1):
+            result = await download_and_process_media(None, message, entity_id=1)
+
+        assert result is None
+        message.download_media.assert_not_called()
+
+
+class TestCleanupMedia:
+    """Tests for cleanup_media."""
+
+    @pytest.mark.asyncio
+    async def test_removes_file(self, tmp_path):
+        """Test an existing file is deleted."""
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"x")
+
+        await cleanup_media(str(path))
+
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_missing_file_is_ignored(self, tmp_path):
+        """Test cleanup of an already removed file does not raise."""
+        await cleanup_media(str(tmp_path / "missing.jpg"))
+        await cleanup_media(None)
@@ -0,0 +1,204 @@
+"""Tests for gemini_ocr module - response parsing and content-hash caching."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from src.ocr import gemini_ocr
+from src.ocr.gemini_ocr import extract_image_text, translate_image_ocr
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Reset OCR caches between tests."""
+    gemini_ocr._upload_cache.clear()
+    gemini_ocr._ocr_cache.clear()
+    gemini_ocr._inflight_ocr.clear()
+    yield
+    gemini_ocr._upload_cache.clear()
+    gemini_ocr._ocr_cache.clear()
+
+
+@pytest.fixture
+def mock_gemini():
+    """Patch path validation, upload and model with mocks."""
+    model = MagicMock()
+    model.generate_content.return_value.text = (
+        "EXTRACTED: Цель 100\nTRANSLATED: Target 100\n"
+    )
+    with patch("src.ocr.gemini_ocr.validate_image_file", return_value=True), \
+            patch("src.ocr.gemini_ocr.genai.upload_file") as upload_file, \
+            patch("src.ocr.gemini_ocr.get_model", return_value=model):
+        yield upload_file, model
+
+
+def _write_image(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestParseOcrResponse:
+    """Tests for _parse_ocr_response."""
+
+    def test_translated_line_extracted(self):
+        """Test the TRANSLATED value is found on a later line."""
+        text = "EXTRACTED: Вход 100\nTRANSLATED:  Entry 100 \nNOTE: extra"
+        assert gemini_ocr._parse_ocr_response(text) == "[Chart text]: Entry 100"
+
+    def test_no_text_markers(self):
+        """Test NO_TEXT_FOUND and empty extraction return None."""
+        assert gemini_ocr._parse_ocr_response("NO_TEXT_FOUND") is None
+        assert gemini_ocr._parse_ocr_response("EXTRACTED: (none)\nTRANSLATED: (none)") is None
+
+    def test_missing_or_empty_translated(self):
+        """Test a missing or empty TRANSLATED line returns None."""
+        assert gemini_ocr._parse_ocr_response("EXTRACTED: abc") is None
+        assert gemini_ocr._parse_ocr_response("TRANSLATED:\nnext line") is None
+
+    def test_translated_must_start_line(self):
+        """Test TRANSLATED: in the middle of a line is ignored."""
+        text = "EXTRACTED: see TRANSLATED: x\nTRANSLATED: real"
+        assert gemini_ocr._parse_ocr_response(text) == "[Chart text]: real"
+
+
+class TestPrepareUpload:
+    """Tests for downscaling large images before upload."""
+
+    def test_small_image_uploaded_unchanged(self, tmp_path, mock_gemini):
+        """Test images within the size limit are uploaded from their own path."""
+        upload_file, _ = mock_gemini
+        path = tmp_path / "small.png"
+        Image.new("RGB", (800, 600)).save(path)
+
+        extract_image_text(str(path))
+
+        upload_file.assert_called_once_with(str(path))
+
+    def test_large_image_downscaled_and_removed(self, tmp_path, mock_gemini):
+        """Test large images are uploaded as a downscaled JPEG that is then deleted."""
+        upload_file, _ = mock_gemini
+        path = tmp_path / "large.png"
+        Image.new("RGBA", (4000, 2000)).save(path)
+        uploaded = {}
+
+        def capture(upload_path):
+            with Image.open(upload_path) as img:
+                uploaded.update(size=img.size, format=img.format)
+            return MagicMock()
+
+        upload_file.side_effect = capture
+
+        extract_image_text(str(path))
+
+        assert uploaded == {"size": (1568, 784), "format": "JPEG"}
+        assert not (tmp_path / "large_ocr.jpg").exists()
+
+
+class TestExtractImageTextCache:
+    """Tests for content-hash caching in extract_image_text."""
+
+    def test_duplicate_image_skips_upload_and_model(self, tmp_path, mock_gemini):
+        """Test identical images are uploaded and processed only once."""
+        upload_file, model = mock_gemini
+        first = _write_image(tmp_path, "a.jpg", b"same-bytes")
+        second = _write_image(tmp_path, "b.jpg", b"same-bytes")
+
+        assert extract_image_text(first) == "[Chart text]: Target 100"
+        assert extract_image_text(second) == "[Chart text]: Target 100"
+
+        assert upload_file.call_count == 1
+        assert model.generate_content.call_count == 1
+
+    def test_no_text_result_not_cached(self, tmp_path, mock_gemini):
+        """Test a None result is asked again rather than kept."""
+        upload_file, model = mock_gemini
+        model.generate_content.return_value.text = "NO_TEXT_FOUND"
+        path = _write_image(tmp_path, "a.jpg", b"blank")
+
+        assert extract_image_text(path) is None
+        assert extract_image_text(path) is None
+        assert model.generate_content.call_count == 2
+        assert upload_file.call_count == 1
+
+    def test_reupload_after_model_failure(self, tmp_path, mock_gemini):
+        """Test a model error drops the upload so the next call re-uploads."""
+        upload_file, model = mock_gemini
+        path = _write_image(tmp_path, "a.jpg", b"retry")
+        model.generate_content.side_effect = [RuntimeError("boom"), MagicMock(text="TRANSLATED: ok")]
+
+        with pytest.raises(RuntimeError):
+            extract_image_text(path)
+        assert extract_image_text(path) == "[Chart text]: ok"
+        assert upload_file.call_count == 2
+
+    def test_stale_upload_replaced(self, tmp_path, mock_gemini):
+        """Test handles older than the TTL are uploaded again."""
+        upload_file, model = mock_gemini
+        model.generate_content.return_value.text = "NO_TEXT_FOUND"
+        path = _write_image(tmp_path, "a.jpg", b"old")
+
+        extract_image_text(path)
+        with patch.object(gemini_ocr, "_UPLOAD_TTL_SEC", -1):
+            extract_image_text(path)
+
+        assert upload_file.call_count == 2
+
+    def test_cache_is_bounded(self, tmp_path, mock_gemini):
+        """Test the oldest entries are evicted beyond the cache limit."""
+        with patch.object(gemini_ocr, "_CACHE_MAX_ENTRIES", 2):
+            for i in range(3):
+                extract_image_text(_write_image(tmp_path, f"{i}.jpg", bytes([i])))
+
+        assert len(gemini_ocr._ocr_cache) == 2
+        assert len(gemini_ocr._upload_cache) == 2
+
+
+class TestTranslateImageOcrCoalescing:
+    """Tests for coalescing concurrent translate_image_ocr calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_images_share_one_request(self, tmp_path, mock_gemini):
+        """Test concurrent calls for the same image content hit Gemini once."""
+        upload_file, model = mock_gemini
+        release = threading.Event()
+        response = model.generate_content.return_value
+
+        def slow_generate(*args, **kwargs):
+            release.wait(timeout=5)
+            return response
+
+        model.generate_content.side_effect = slow_generate
+        paths = [_write_image(tmp_path, f"{i}.jpg", b"same") for i in range(3)]
+
+        tasks = [asyncio.create_task(translate_image_ocr(p)) for p in paths]
+        await asyncio.sleep(0.1)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert results == ["[Chart text]: Target 100"] * 3
+        assert model.generate_content.call_count == 1
+        assert gemini_ocr._inflight_ocr == {}
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_joined_callers(self, tmp_path, mock_gemini):
+        """Test a failed shared request returns None to every caller."""
+        upload_file, model = mock_gemini
+        release = threading.Event()
+
+        def failing_generate(*args, **kwargs):
+            release.wait(timeout=5)
+            raise RuntimeError("boom")
+
+        model.generate_content.side_effect = failing_generate
+        paths = [_write_image(tmp_path, f"{i}.jpg", b"same") for i in range(2)]
+
+        tasks = [asyncio.create_task(translate_image_ocr(p)) for p in paths]
+        await asyncio.sleep(0.1)
+        release.set()
+
+        assert await asyncio.gather(*tasks) == [None, None]
+        assert model.generate_content.call_count == 1
@@ -0,0 +1,348 @@
+"""Tests for ocr.image_editor - vision extraction caching and the edit pipeline."""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from src.ocr import image_editor
+from src.ocr.image_editor import extract_text_from_image
+from src.vision.base import TextExtraction
+
+
+@pytest.fixture(autouse=True)
+def clear_extraction_cache():
+    """Reset the extraction cache between tests."""
+    image_editor._extraction_cache.clear()
+    image_editor._inflight_extractions.clear()
+    yield
+    image_editor._extraction_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def edit_cache_dir(tmp_path):
+    """Keep edit cache copies in a temp dir and start each test empty."""
+    cache_dir = tmp_path / "edit_cache"
+    cache_dir.mkdir()
+    image_editor._edit_cache.clear()
+    with patch.object(image_editor, "_edit_cache_dir", str(cache_dir)):
+        yield cache_dir
+    image_editor._edit_cache.clear()
+
+
+@pytest.fixture
+def mock_chain():
+    """Patch get_vision_chain with a chain returning one extraction."""
+    chain = MagicMock()
+    chain.extract_text = AsyncMock(return_value=MagicMock(
+        extractions=[TextExtraction(original="Вход", translated="Entry")],
+        provider_name="mock",
+    ))
+    with patch("src.ocr.image_editor.get_vision_chain", AsyncMock(return_value=chain)):
+        yield chain
+
+
+class TestExtractTextFromImageCache:
+    """Tests for caching in extract_text_from_image."""
+
+    @pytest.mark.asyncio
+    async def test_identical_pixels_hit_cache(self, mock_chain):
+        """Test a second image with the same pixels skips the vision chain."""
+        first = Image.new("RGB", (32, 32), "white")
+        second = Image.new("RGB", (32, 32), "white")
+
+        assert await extract_text_from_image(first) == {"Вход": "Entry"}
+        assert await extract_text_from_image(second) == {"Вход": "Entry"}
+        assert mock_chain.extract_text.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_different_pixels_miss_cache(self, mock_chain):
+        """Test images with different content are extracted separately."""
+        await extract_text_from_image(Image.new("RGB", (32, 32), "white"))
+        await extract_text_from_image(Image.new("RGB", (32, 32), "black"))
+
+        assert mock_chain.extract_text.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_not_cached(self, mock_chain):
+        """Test a failed extraction is retried on the next call."""
+        mock_chain.extract_text.side_effect = [RuntimeError("down"), mock_chain.extract_text.return_value]
+        image = Image.new("RGB", (32, 32), "white")
+
+        assert await extract_text_from_image(image) == {}
+        assert await extract_text_from_image(image) == {"Вход": "Entry"}
+        assert mock_chain.extract_text.await_count == 2
+
+
+    @pytest.mark.asyncio
+    async def test_duplicates_and_untranslated_text_dropped(self, mock_chain):
+        """Test repeated labels keep their first reading and unchanged text is skipped."""
+        mock_chain.extract_text.return_value.extractions = [
+            TextExtraction(original="Тейк", translated="TP"),
+            TextExtraction(original="Тейк", translated="Take"),
+            TextExtraction(original="BTC", translated="BTC"),
+        ]
+
+        assert await extract_text_from_image(Image.new("RGB", (32, 32))) == {"Тейк": "TP"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_images_share_request(self, mock_chain):
+        """Test concurrent extractions of the same pixels call the chain once."""
+        release = asyncio.Event()
+        result = mock_chain.extract_text.return_value
+
+        async def slow_extract(image):
+            await release.wait()
+            return result
+
+        mock_chain.extract_text.side_effect = slow_extract
+        tasks = [
+            asyncio.create_task(extract_text_from_image(Image.new("RGB", (32, 32), "white")))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks)
+
+        assert results == [{"Вход": "Entry"}] * 3
+        assert mock_chain.extract_text.await_count == 1
+        assert image_editor._inflight_extractions == {}
+
+
+class TestEditImageTextResize:
+    """Tests for the image size sent to the vision chain."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("source_size, expected_size", [
+        ((3000, 1500), (1024, 512)),
+        ((800, 600), (800, 600)),
+        ((400, 300), (400, 300)),
+    ])
+    async def test_vision_image_capped_not_upscaled(self, tmp_path, source_size, expected_size):
+        """Test large images are downscaled and small ones are left as is."""
+        path = tmp_path / "chart.png"
+        Image.new("RGB", source_size).save(path)
+        seen = {}
+
+        async def capture(image, cache_key=None):
+            seen["size"] = image.size
+            return {}
+
+        with patch("src.ocr.image_editor.validate_image_file", return_value=True), \
+                patch("src.ocr.image_editor.extract_text_from_image", side_effect=capture):
+            assert await image_editor.edit_image_text(str(path), str(tmp_path / "out.png")) is None
+
+        assert seen["size"] == expected_size
+
+    @pytest.mark.asyncio
+    async def test_cache_key_hashed_off_event_loop(self, tmp_path):
+        """Test the pixel hash is computed in the decode thread and passed along."""
+        path = tmp_path / "chart.png"
+        Image.new("RGB", (64, 64), "white").save(path)
+        hashed_on = []
+        hash_image = image_editor._image_cache_key
+        seen = {}
+
+        def record_hash(image):
+            hashed_on.append(threading.current_thread())
+            return hash_image(image)
+
+        async def capture(image, cache_key=None):
+            seen["key"] = cache_key
+            return {}
+
+        with patch("src.ocr.image_editor.validate_image_file", return_value=True), \
+                patch("src.ocr.image_editor._image_cache_key", side_effect=record_hash), \
+                patch("src.ocr.image_editor.extract_text_from_image", side_effect=capture):
+            assert await image_editor.edit_image_text(str(path), str(tmp_path / "out.png")) is None
+
+        assert hashed_on and threading.current_thread() not in hashed_on
+        assert seen["key"] == hash_image(Image.new("RGB", (64, 64), "white"))
+
+
+class TestSharedEditor:
+    """Tests for the shared image editor used by Stage 2."""
+
+    @pytest.fixture(autouse=True)
+    def reset_editor(self):
+        image_editor._editor = None
+        yield
+        image_editor._editor = None
+
+    async def _run(self, tmp_path, extractions, name="chart.png", color="white"):
+        path = tmp_path / name
+        Image.new("RGB", (64, 64), color).save(path)
+
+        with patch("src.ocr.image_editor.validate_image_file", return_value=True), \
+                patch("src.ocr.image_editor.extract_text_from_image", AsyncMock(return_value=extractions)):
+            return await image_editor.edit_image_text(str(path), str(tmp_path / f"{name}.out.png"))
+
+    @pytest.mark.asyncio
+    async def test_editor_built_once_and_kept_open(self, tmp_path):
+        """Test consecutive edits reuse one editor without closing it."""
+        editor = MagicMock()
+        editor.edit_image.return_value = MagicMock(success=True)
+
+        with patch("src.ocr.image_editor.ImageEditorFactory.get_editor_with_fallback",
+                   return_value=editor) as factory:
+            assert await self._run(tmp_path, {"Вход": "Entry"}) == str(tmp_path / "chart.png.out.png")
+            await self._run(tmp_path, {"Стоп": "Stop"}, name="other.png", color="black")
+
+        factory.assert_called_once()
+        editor.warmup.assert_called_once()
+        assert editor.edit_image.call_count == 2
+        editor.close.assert_not_called()
+        # Stage 2 gets the bytes read for Stage 1 rather than re-reading the file
+        assert editor.edit_image.call_args_list[0].kwargs["image_bytes"] == (tmp_path / "chart.png").read_bytes()
+
+    @pytest.mark.asyncio
+    async def test_editor_not_built_when_no_text(self, tmp_path):
+        """Test Stage 2 setup is skipped when Stage 1 finds nothing."""
+        with patch("src.ocr.image_editor.ImageEditorFactory.get_editor_with_fallback") as factory:
+            assert await self._run(tmp_path, {}) is None
+
+        factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_editor_not_built_without_cyrillic(self, tmp_path):
+        """Test images whose text has no Cyrillic are left to the original."""
+        with patch("src.ocr.image_editor.ImageEditorFactory.get_editor_with_fallback") as factory:
+            assert await self._run(tmp_path, {"long": "LONG"}) is None
+
+        factory.assert_not_called()
+
+    def test_close_image_editor(self):
+        """Test shutdown closes the shared editor and drops it."""
+        editor = MagicMock()
+        image_editor._editor = editor
+
+        image_editor.close_image_editor()
+        image_editor.close_image_editor()
+
+        editor.close.assert_called_once()
+        assert image_editor._editor is None
+
+
+class TestEditImageTextEditCache:
+    """Tests for reusing edited outputs of identical source files."""
+
+    async def _edit(self, tmp_path, name, editor, color="white"):
+        source = tmp_path / name
+        Image.new("RGB", (64, 64), color).save(source)
+        output = tmp_path / f"{name}_edited.png"
+
+        with patch("src.ocr.image_editor.validate_image_file", return_value=True), \
+                patch("src.ocr.image_editor.extract_text_from_image",
+                      AsyncMock(return_value={"Вход": "Entry"})) as extract, \
+                patch("src.ocr.image_editor._get_editor", return_value=editor):
+            result = await image_editor.edit_image_text(str(source), str(output))
+        return result, output, extract
+
+    def _editor(self):
+        def edit_image(image_path, translations, output_path, image_bytes):
+            Image.new("RGB", (64, 64), "blue").save(output_path)
+            return MagicMock(success=True)
+
+        editor = MagicMock()
+        editor.edit_image.side_effect = edit_image
+        return editor
+
+    @pytest.mark.asyncio
+    async def test_repeated_file_copied_from_cache(self, tmp_path, edit_cache_dir):
+        """Test a second identical file skips both stages and gets the cached output."""
+        editor = self._editor()
+        first, first_output, _ = await self._edit(tmp_path, "a.png", editor)
+        first_output_bytes = first_output.read_bytes()
+        first_output.unlink()  # handlers delete outputs after sending
+
+        second, second_output, extract = await self._edit(tmp_path, "b.png", editor)
+
+        assert first == str(first_output)
+        assert second == str(second_output)
+        assert second_output.read_bytes() == first_output_bytes
+        extract.assert_not_called()
+        assert editor.edit_image.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_bounded_and_evicted_files_removed(self, tmp_path, edit_cache_dir):
+        """Test the oldest cached copies are deleted beyond the limit."""
+        editor = self._editor()
+        with patch.object(image_editor, "_EDIT_CACHE_MAX_ENTRIES", 1):
+            await self._edit(tmp_path, "a.png", editor)
+            await self._edit(tmp_path, "b.png", editor, color="black")
+
+        assert len(image_editor._edit_cache) == 1
+        assert len(list(edit_cache_dir.iterdir())) == 1
+
+
+class TestEditImageTextAsync:
+    """Tests for the native async pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_stage1_awaited_on_calling_loop(self, tmp_path):
+        """Test vision extraction runs on the caller's loop, not in a thread."""
+        path = tmp_path / "chart.png"
+        Image.new("RGB", (64, 64)).save(path)
+        seen = {}
+
+        async def extract(image, cache_key=None):
+            seen["loop"] = asyncio.get_running_loop()
+            seen["thread"] = threading.current_thread()
+            return {}
+
+        with patch("src.ocr.image_editor.validate_image_file", return_value=True), \
+                patch("src.ocr.image_editor.extract_text_from_image", side_effect=extract), \
+                patch("src.ocr.image_editor._get_editor", return_value=MagicMock()):
+            assert await image_editor.edit_image_text(str(path), str(tmp_path / "out.png")) is None
+
+        assert seen["loop"] is asyncio.get_running_loop()
+        assert seen["thread"] is threading.current_thread()
+
+    @pytest.mark.asyncio
+    async def test_invalid_path_returns_none(self, tmp_path):
+        """Test an invalid source never reaches the vision chain."""
+        with patch("src.ocr.image_editor.validate_image_file", return_value=False), \
+                patch("src.ocr.image_editor.extract_text_from_image") as extract:
+            assert await image_editor.edit_image_text(str(tmp_path / "x.png"), str(tmp_path / "o.png")) is None
+
+        extract.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_edits_limited(self, tmp_path):
+        """Test Stage 2 runs at most IMAGE_EDITOR_MAX_CONCURRENT edits at once."""
+        lock = threading.Lock()
+        active = peak = 0
+
+        def edit_image(**kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            threading.Event().wait(0.05)
+            with lock:
+                active -= 1
+            return MagicMock(success=False)
+
+        editor = MagicMock()
+        editor.edit_image.side_effect = edit_image
+        paths = []
+        for i, color in enumerate(["red", "green", "blue"]):
+            path = tmp_path / f"{i}.png"
+            Image.new("RGB", (16, 16), color).save(path)
+            paths.append(path)
+
+        with patch.object(image_editor.config, "IMAGE_EDITOR_MAX_CONCURRENT", 1), \
+                patch.object(image_editor, "_edit_semaphore", None), \
+                patch("src.ocr.image_editor.validate_image_file", return_value=True), \
+                patch("src.ocr.image_editor.extract_text_from_image",
+                      AsyncMock(return_value={"Вход": "Entry"})), \
+                patch("src.ocr.image_editor._get_editor", return_value=editor):
+            await asyncio.gather(*[
+                image_editor.edit_image_text(str(p), str(tmp_path / f"{p.stem}_out.png")) for p in paths
+            ])
+
+        assert editor.edit_image.call_count == 3
+        assert peak == 1
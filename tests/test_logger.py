@@ -1,6 +1,8 @@
 """Tests for logger utilities."""
 
-from src.utils.logger import SENSITIVE_PATTERNS, mask_sensitive_data
+import logging
+
+from src.utils.logger import SENSITIVE_PATTERNS, is_debug_enabled, mask_sensitive_data
 
 
 class TestMaskSensitiveData:
@@ -146,3 +148,19 @@ class TestMaskSensitiveData:
         assert "MASKED" in result["message"]
         assert "User logged in" in result["message"]
         assert "status: success" in result["message"]
+
+
+class TestIsDebugEnabled:
+    """Tests for is_debug_enabled."""
+
+    def test_follows_stdlib_level(self):
+        """Test the check reflects the named logger's effective level."""
+        stdlib_logger = logging.getLogger("tests.debug_check")
+        try:
+            stdlib_logger.setLevel(logging.INFO)
+            assert not is_debug_enabled("tests.debug_check")
+
+            stdlib_logger.setLevel(logging.DEBUG)
+            assert is_debug_enabled("tests.debug_check")
+        finally:
+            stdlib_logger.setLevel(logging.NOTSET)
@@ -101,7 +101,6 @@ class TestDirectImports:
         try:
             from src.ocr import image_editor
             assert hasattr(image_editor, 'edit_image_text'), "Should have edit_image_text function"
-            assert hasattr(image_editor, 'edit_image_text_sync'), "Should have edit_image_text_sync function"
             print("Successfully imported src.ocr.image_editor")
         except ImportError as e:
             pytest.fail(f"Failed to import image_editor: {e}")
@@ -254,11 +253,316 @@ class TestImageEditorModule:
 
         assert hasattr(image_editor, 'get_vision_chain'), "Should have get_vision_chain"
         assert hasattr(image_editor, 'extract_text_from_image'), "Should have extract_text_from_image"
-        assert hasattr(image_editor, 'edit_image_text_sync'), "Should have edit_image_text_sync"
         assert hasattr(image_editor, 'edit_image_text'), "Should have edit_image_text"
         print("Image editor module has all required functions")
 
 
+class TestOpenAIImageEditor:
+    """Test OpenAI image editor helpers."""
+
+    def test_decode_b64_image_roundtrip(self):
+        """Test base64 payload decodes to the original bytes."""
+        import base64
+
+        from src.image_editing.openai_editor import OpenAIImageEditor
+
+        payload = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+        encoded = base64.b64encode(payload).decode()
+
+        assert OpenAIImageEditor._decode_b64_image(encoded) == payload
+        assert OpenAIImageEditor._decode_b64_image(encoded.encode()) == payload
+
+    def test_decode_b64_image_uses_pybase64(self):
+        """Test payloads are decoded with pybase64 without validation."""
+        from src.image_editing import openai_editor
+
+        fast = Mock()
+        fast.b64decode.return_value = b"decoded"
+
+        with patch.object(openai_editor, "pybase64", fast):
+            assert openai_editor.OpenAIImageEditor._decode_b64_image("ZGVjb2RlZA==") == b"decoded"
+
+        fast.b64decode.assert_called_once_with("ZGVjb2RlZA==", validate=False)
+
+    def test_edit_image_skips_api_without_translations(self, tmp_path):
+        """Test empty translations return the original image without calling OpenAI."""
+        from PIL import Image
+
+        from src.image_editing.openai_editor import OpenAIImageEditor
+
+        image_path = tmp_path / "signal.png"
+        output_path = tmp_path / "signal_edited.png"
+        Image.new("RGB", (8, 8), "white").save(image_path)
+
+        editor = OpenAIImageEditor(api_key="test-key")
+        editor._get_client = Mock(side_effect=AssertionError("API must not be called"))
+
+        with patch('src.image_editing.openai_editor.validate_image_file', return_value=True):
+            result = editor.edit_image(str(image_path), {}, str(output_path))
+
+        assert result.success is True
+        assert result.metadata["skipped"] is True
+        assert result.edited_image.size == (8, 8)
+        assert output_path.read_bytes() == image_path.read_bytes()
+
+
+    def test_edit_image_uploads_mapped_file_and_mask(self, tmp_path):
+        """Test image and in-memory mask are uploaded and the b64 result decoded."""
+        import base64
+        import io
+
+        import httpx
+        from openai import OpenAI
+        from PIL import Image
+
+        from src.image_editing.openai_editor import OpenAIImageEditor
+
+        image_path = tmp_path / "signal.png"
+        Image.new("RGB", (300, 200), "red").save(image_path)
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request.read())
+            buffer = io.BytesIO()
+            Image.new("RGB", (1536, 1024), "blue").save(buffer, "PNG")
+            payload = base64.b64encode(buffer.getvalue()).decode()
+            return httpx.Response(200, json={"created": 0, "data": [{"b64_json": payload}]})
+
+        editor = OpenAIImageEditor(api_key="test-key")
+        editor._client = OpenAI(
+            api_key="test-key",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler))
+        )
+
+        with patch('src.image_editing.openai_editor.validate_image_file', return_value=True):
+            result = editor.edit_image(str(image_path), {"Вход": "Entry"})
+
+        assert result.success is True
+        assert result.edited_image.size == (1536, 1024)
+        assert len(requests_seen) == 1
+        # Both the source image and the mask are PNG parts of the upload
+        assert requests_seen[0].count(b"\x89PNG") == 2
+        assert b'name="size"' in requests_seen[0]
+
+    def test_edit_image_downloads_url_result_with_timeout(self, tmp_path):
+        """Test a legacy URL result is fetched with httpx and a timeout."""
+        import io
+
+        import httpx
+        from openai import OpenAI
+        from PIL import Image
+
+        from src.image_editing import openai_editor
+        from src.image_editing.openai_editor import OpenAIImageEditor
+
+        image_path = tmp_path / "signal.png"
+        Image.new("RGB", (300, 200), "red").save(image_path)
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 64), "blue").save(buffer, "PNG")
+
+        def handler(request):
+            return httpx.Response(200, json={"created": 0, "data": [{"url": "https://img.test/x.png"}]})
+
+        editor = OpenAIImageEditor(api_key="test-key")
+        editor._client = OpenAI(
+            api_key="test-key",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler))
+        )
+        download = MagicMock(return_value=httpx.Response(
+            200, content=buffer.getvalue(), request=httpx.Request("GET", "https://img.test/x.png")
+        ))
+
+        with patch('src.image_editing.openai_editor.validate_image_file', return_value=True), \
+                patch('src.image_editing.openai_editor.httpx.get', download):
+            result = editor.edit_image(str(image_path), {"Вход": "Entry"})
+
+        assert result.success is True
+        assert result.edited_image.size == (64, 64)
+        download.assert_called_once_with(
+            "https://img.test/x.png", timeout=openai_editor._IMAGE_DOWNLOAD_TIMEOUT_SEC
+        )
+
+    def test_edit_image_uses_supplied_bytes(self, tmp_path):
+        """Test bytes passed by the caller are uploaded without re-reading the file."""
+        import io
+
+        from PIL import Image
+
+        from src.image_editing.openai_editor import OpenAIImageEditor
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (300, 200), "red").save(buffer, "PNG")
+        missing_path = tmp_path / "not_on_disk.png"
+
+        editor = OpenAIImageEditor(api_key="test-key")
+        client = Mock()
+        client.images.edit.return_value.data = []
+        editor._client = client
+
+        with patch('src.image_editing.openai_editor.validate_image_file', return_value=True):
+            result = editor.edit_image(
+                str(missing_path), {"Вход": "Entry"}, image_bytes=buffer.getvalue()
+            )
+
+        assert result.error == "OpenAI returned empty response"
+        _, uploaded = client.images.edit.call_args.kwargs["image"]
+        assert uploaded.getvalue() == buffer.getvalue()
+
+
+class TestGeminiImageEditor:
+    """Test GeminiImageEditor client handling."""
+
+    def test_clients_share_connection_pool(self):
+        """Test every editor's client reuses one HTTP pool that close() leaves open."""
+        from src.image_editing.gemini_editor import GeminiImageEditor, _get_http_client
+
+        first = GeminiImageEditor(api_key="test-key")
+        first_http = first._get_client()._api_client._httpx_client
+        first.close()
+
+        second = GeminiImageEditor(api_key="test-key")
+        second_http = second._get_client()._api_client._httpx_client
+        second.close()
+
+        assert first_http is second_http is _get_http_client()
+        assert not first_http.is_closed
+
+    def test_input_image_downscaled_only_when_large(self):
+        """Test large sources are re-encoded as JPEG and small ones sent as is."""
+        import io
+
+        from PIL import Image
+
+        from src.image_editing.gemini_editor import _prepare_input_image
+
+        def encode(size, mode="RGB"):
+            buffer = io.BytesIO()
+            Image.new(mode, size).save(buffer, "PNG")
+            return buffer.getvalue()
+
+        small = encode((800, 600))
+        assert _prepare_input_image(small) == (small, "image/png")
+
+        data, mime_type = _prepare_input_image(encode((4000, 2000), "RGBA"))
+        with Image.open(io.BytesIO(data)) as img:
+            assert (img.format, img.size) == ("JPEG", (1568, 784))
+        assert mime_type == "image/jpeg"
+
+    def test_stream_stops_at_first_image(self, tmp_path):
+        """Test the streamed response is closed once an image part arrives."""
+        import io
+        from unittest.mock import patch
+
+        from PIL import Image
+
+        from src.image_editing.gemini_editor import GeminiImageEditor
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), "red").save(buffer, "PNG")
+        source = tmp_path / "chart.png"
+        source.write_bytes(buffer.getvalue())
+
+        def chunk(**part_fields):
+            part = MagicMock(**{"inline_data": None, **part_fields})
+            return MagicMock(candidates=[MagicMock(content=MagicMock(parts=[part]))])
+
+        consumed = []
+
+        def stream(**kwargs):
+            consumed.append("text")
+            yield chunk(text="Here is the image")
+            consumed.append("image")
+            yield chunk(inline_data=MagicMock(data=buffer.getvalue(), mime_type="image/png"))
+            consumed.append("trailing")
+            yield chunk(text="Done")
+
+        editor = GeminiImageEditor(api_key="test-key")
+        client = MagicMock()
+        client.models.generate_content_stream.side_effect = stream
+        output = tmp_path / "out.png"
+
+        with patch("src.image_editing.gemini_editor.validate_image_file", return_value=True), \
+                patch.object(editor, "_get_client", return_value=client):
+            result = editor.edit_image(str(source), {"Вход": "Entry"}, output_path=str(output))
+
+        assert result.success
+        assert output.read_bytes() == buffer.getvalue()
+        assert consumed == ["text", "image"]
+
+    @pytest.mark.parametrize("translations, has_instruction", [
+        ({"Вход": "Entry"}, True),
+        ({}, False),
+    ])
+    def test_system_instruction_only_with_translations(self, tmp_path, translations,
+                                                       has_instruction):
+        """Test the replace-only rules are not sent with the translate-all prompt."""
+        import io
+        from unittest.mock import patch
+
+        from PIL import Image
+
+        from src.image_editing.gemini_editor import _SYSTEM_INSTRUCTION, GeminiImageEditor
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), "red").save(buffer, "PNG")
+        source = tmp_path / "chart.png"
+        source.write_bytes(buffer.getvalue())
+
+        editor = GeminiImageEditor(api_key="test-key")
+        client = MagicMock()
+        client.models.generate_content_stream.return_value = iter([])
+
+        with patch("src.image_editing.gemini_editor.validate_image_file", return_value=True), \
+                patch.object(editor, "_get_client", return_value=client):
+            editor.edit_image(str(source), translations)
+
+        config = client.models.generate_content_stream.call_args.kwargs["config"]
+        if has_instruction:
+            assert config.system_instruction == _SYSTEM_INSTRUCTION
+        else:
+            assert config is None
+
+
+class TestSaveEditedImage:
+    """Test saving edited images returned by editors."""
+
+    def test_writes_raw_bytes_when_format_matches(self, tmp_path):
+        """Test PNG bytes are written unchanged to a .png output path."""
+        import io
+
+        from PIL import Image
+
+        from src.image_editing.base import save_edited_image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4), "red").save(buffer, "PNG")
+        raw = buffer.getvalue()
+        output_path = tmp_path / "edited.png"
+
+        save_edited_image(Image.open(io.BytesIO(raw)), str(output_path), raw_bytes=raw)
+
+        assert output_path.read_bytes() == raw
+
+    def test_reencodes_rgba_png_to_jpeg(self, tmp_path):
+        """Test RGBA PNG output is converted when saving to a .jpg path."""
+        import io
+
+        from PIL import Image
+
+        from src.image_editing.base import save_edited_image
+
+        buffer = io.BytesIO()
+        Image.new("RGBA", (4, 4), (255, 0, 0, 128)).save(buffer, "PNG")
+        raw = buffer.getvalue()
+        output_path = tmp_path / "edited.jpg"
+
+        save_edited_image(Image.open(io.BytesIO(raw)), str(output_path), raw_bytes=raw)
+
+        with Image.open(output_path) as saved:
+            assert saved.format == "JPEG"
+            assert saved.mode == "RGB"
+
+
 class TestEndToEnd:
     """End-to-end integration tests."""
 
@@ -83,11 +83,34 @@ SL: $90000
         result = parse_trading_signal(text)
         assert result['direction'] == 'LONG'
 
+    def test_pair_after_other_slashes(self):
+        """Test the pair is found past slashes that are not part of a pair."""
+        text = "#Идея 50/50 setup, see x/Y and SOL/USDT (not ETH/usdt) 1H"
+        assert parse_trading_signal(text)['pair'] == 'SOL/USDT'
+
+    def test_pair_inside_word_ignored(self):
+        assert parse_trading_signal("#Идея aBTC/USDT LONG")['pair'] is None
+
+    def test_russian_direction_normalized(self):
+        assert parse_trading_signal("#Идея BTC/USDT шорт")['direction'] == 'SHORT'
+        assert parse_trading_signal("#Идея BTC/USDT ЛОНГ")['direction'] == 'LONG'
+
     def test_russian_stop_loss(self):
         text = "#Идея Стоп: 50000"
         result = parse_trading_signal(text)
         assert result['sl'] == 50000.0
 
+    def test_mixed_case_keywords(self):
+        """Test keyword pre-checks do not skip case-insensitive matches."""
+        text = "#Идея ТЕЙК 1: 1.5\ntp2: 2.5\nStop sl: 0.5\nвход: 1-2\nриск: 3"
+        result = parse_trading_signal(text)
+
+        assert result['tp1'] == 1.5
+        assert result['tp2'] == 2.5
+        assert result['sl'] == 0.5
+        assert result['entry_range'] == '1-2'
+        assert result['risk_percent'] == 3.0
+
     def test_timeframe_minutes(self):
         text = "#Идея 15M"
         result = parse_trading_signal(text)
@@ -0,0 +1,98 @@
+"""Tests for utils.retry - transient error classification and backoff."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.utils import retry
+from src.utils.retry import backoff_delay, call_with_retry, is_transient_error
+from src.vision.base import VisionProviderError
+
+
+class ResourceExhausted(Exception):
+    """Stand-in for google.api_core.exceptions.ResourceExhausted."""
+
+
+class StatusError(Exception):
+    """Error carrying an HTTP status, like the openai/anthropic SDK errors."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TestIsTransientError:
+    """Tests for is_transient_error."""
+
+    @pytest.mark.parametrize("error", [
+        TimeoutError("slow"),
+        ConnectionResetError("reset"),
+        ResourceExhausted("quota"),
+        StatusError(429),
+        StatusError(503),
+    ])
+    def test_transient(self, error):
+        """Test timeouts, rate limits and 5xx are retried."""
+        assert is_transient_error(error)
+
+    @pytest.mark.parametrize("error", [
+        ValueError("bad input"),
+        StatusError(400),
+        StatusError(401),
+    ])
+    def test_permanent(self, error):
+        """Test client errors are not retried."""
+        assert not is_transient_error(error)
+
+    def test_wrapped_cause_inspected(self):
+        """Test provider errors are classified by the SDK error they wrap."""
+        try:
+            try:
+                raise StatusError(429)
+            except StatusError as e:
+                raise VisionProviderError("failed", provider="openai") from e
+        except VisionProviderError as wrapped:
+            assert is_transient_error(wrapped)
+
+
+class TestBackoffDelay:
+    """Tests for backoff_delay."""
+
+    def test_bounds_grow_and_are_capped(self):
+        """Test the jitter range doubles per attempt up to the cap."""
+        with patch("src.utils.retry.random.uniform", side_effect=lambda a, b: b):
+            assert [backoff_delay(n) for n in range(6)] == [0.5, 1.0, 2.0, 4.0, 8.0, 8.0]
+
+
+class TestCallWithRetry:
+    """Tests for call_with_retry."""
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self):
+        with patch.object(retry.time, "sleep") as sleep:
+            yield sleep
+
+    def test_transient_error_retried(self, no_sleep):
+        """Test a transient failure is retried and the result returned."""
+        func = MagicMock(side_effect=[StatusError(503), "ok"])
+
+        assert call_with_retry(func, attempts=3) == "ok"
+        assert func.call_count == 2
+        no_sleep.assert_called_once()
+
+    def test_gives_up_after_attempts(self):
+        """Test the last transient error is raised once attempts run out."""
+        func = MagicMock(side_effect=StatusError(429))
+
+        with pytest.raises(StatusError):
+            call_with_retry(func, attempts=3)
+        assert func.call_count == 3
+
+    def test_permanent_error_not_retried(self, no_sleep):
+        """Test non-transient errors are raised immediately."""
+        func = MagicMock(side_effect=ValueError("bad"))
+
+        with pytest.raises(ValueError):
+            call_with_retry(func, attempts=3)
+        assert func.call_count == 1
+        no_sleep.assert_not_called()
@@ -75,7 +75,7 @@ class TestHandleSignalUpdateUserFiltering:
              patch('src.handlers.update_handler.build_final_message', return_value='Final') as mock_build, \
              patch('src.handlers.update_handler.get_publisher_client') as mock_get_publisher, \
              patch('src.handlers.update_handler.db_update_signal_update', new_callable=AsyncMock) as mock_update_signal_update, \
-             patch('src.handlers.update_handler.cleanup_media'):
+             patch('src.handlers.update_handler.cleanup_media', new_callable=AsyncMock):
 
             mock_find_update.return_value = None
             mock_find_signal.return_value = parent_signal_dict
@@ -137,7 +137,7 @@ class TestHandleSignalUpdateUserFiltering:
              patch('src.handlers.update_handler.build_final_message', return_value='Final') as mock_build, \
              patch('src.handlers.update_handler.get_publisher_client') as mock_get_publisher, \
              patch('src.handlers.update_handler.db_update_signal_update', new_callable=AsyncMock) as mock_update_signal_update, \
-             patch('src.handlers.update_handler.cleanup_media'):
+             patch('src.handlers.update_handler.cleanup_media', new_callable=AsyncMock):
 
             mock_find_update.return_value = None
             mock_find_signal.return_value = parent_signal_dict
@@ -196,7 +196,7 @@ class TestHandleSignalUpdateUserFiltering:
              patch('src.handlers.update_handler.build_final_message', return_value='Final') as mock_build, \
              patch('src.handlers.update_handler.get_publisher_client') as mock_get_publisher, \
              patch('src.handlers.update_handler.db_update_signal_update', new_callable=AsyncMock) as mock_update_signal_update, \
-             patch('src.handlers.update_handler.cleanup_media'):
+             patch('src.handlers.update_handler.cleanup_media', new_callable=AsyncMock):
 
             mock_find_update.return_value = None
             mock_find_signal.return_value = parent_signal_dict
@@ -238,7 +238,7 @@ class TestHandleSignalUpdateUserFiltering:
              patch('src.handlers.update_handler.build_final_message', return_value='Final') as mock_build, \
              patch('src.handlers.update_handler.get_publisher_client') as mock_get_publisher, \
              patch('src.handlers.update_handler.db_update_signal_update', new_callable=AsyncMock) as mock_update_signal_update, \
-             patch('src.handlers.update_handler.cleanup_media'):
+             patch('src.handlers.update_handler.cleanup_media', new_callable=AsyncMock):
 
             mock_find_update.return_value = None
             mock_find_signal.return_value = parent_signal_dict
@@ -281,7 +281,7 @@ class TestHandleSignalUpdateUserFiltering:
              patch('src.handlers.update_handler.build_final_message', return_value='Final') as mock_build, \
              patch('src.handlers.update_handler.get_publisher_client') as mock_get_publisher, \
              patch('src.handlers.update_handler.db_update_signal_update', new_callable=AsyncMock) as mock_update_signal_update, \
-             patch('src.handlers.update_handler.cleanup_media'):
+             patch('src.handlers.update_handler.cleanup_media', new_callable=AsyncMock):
 
             mock_find_update.return_value = None
             mock_find_signal.return_value = parent_signal_dict
@@ -0,0 +1,82 @@
+"""Tests for vision.base - image encoding and response parsing."""
+
+import base64
+from io import BytesIO
+
+from PIL import Image
+
+from src.vision.base import image_to_data_url, parse_extraction_lines
+
+
+def _decode(data_url):
+    header, encoded = data_url.split(",", 1)
+    return header, Image.open(BytesIO(base64.b64decode(encoded)))
+
+
+class TestImageToDataUrl:
+    """Tests for image_to_data_url."""
+
+    def test_rgb_encoded_as_jpeg(self):
+        """Test opaque images are sent as JPEG."""
+        header, image = _decode(image_to_data_url(Image.new("RGB", (64, 32), "red")))
+
+        assert header == "data:image/jpeg;base64"
+        assert image.format == "JPEG"
+        assert image.size == (64, 32)
+
+    def test_grayscale_converted_to_jpeg(self):
+        """Test non-RGB opaque modes are converted and sent as JPEG."""
+        header, image = _decode(image_to_data_url(Image.new("L", (16, 16))))
+
+        assert header == "data:image/jpeg;base64"
+        assert image.mode == "RGB"
+
+    def test_alpha_encoded_as_png(self):
+        """Test images with an alpha channel stay lossless PNG."""
+        header, image = _decode(image_to_data_url(Image.new("RGBA", (16, 16))))
+
+        assert header == "data:image/png;base64"
+        assert image.format == "PNG"
+        assert image.mode == "RGBA"
+
+
+class TestParseExtractionLines:
+    """Tests for parse_extraction_lines."""
+
+    def _pairs(self, text):
+        return [(e.original, e.translated) for e in parse_extraction_lines(text)]
+
+    def test_ascii_and_unicode_arrows(self):
+        """Test all supported arrow styles separate original and translation."""
+        text = (
+            "ORIGINAL: ЛОНГ -> ENGLISH: LONG\n"
+            "ORIGINAL: Тейк 1 → ENGLISH: TP 1\n"
+            "ORIGINAL: Стоп ➔ ENGLISH: Stop\n"
+            "ORIGINAL: Вход ⟶ ENGLISH: Entry\n"
+        )
+        assert self._pairs(text) == [
+            ("ЛОНГ", "LONG"), ("Тейк 1", "TP 1"), ("Стоп", "Stop"), ("Вход", "Entry"),
+        ]
+
+    def test_hyphenated_text_kept(self):
+        """Test hyphens that are not arrows stay in the text."""
+        assert self._pairs("ORIGINAL: Стоп-лосс → ENGLISH: Stop-loss") == [("Стоп-лосс", "Stop-loss")]
+
+    def test_splits_on_first_arrow(self):
+        """Test later arrows belong to the translation."""
+        assert self._pairs("ORIGINAL: A -> ENGLISH: B -> C") == [("A", "B -> C")]
+
+    def test_skips_noise_and_incomplete_lines(self):
+        """Test prose, empty parts and CRLF endings are handled."""
+        text = (
+            "Here are the results:\r\n"
+            "ORIGINAL: 5x -> ENGLISH: 5x\r\n"
+            "ORIGINAL:  -> ENGLISH: empty\n"
+            "ORIGINAL: dangling ->\n"
+            "ENGLISH: only\n"
+        )
+        assert self._pairs(text) == [("5x", "5x")]
+
+    def test_list_prefix_dropped(self):
+        """Test bullet or number prefixes before ORIGINAL: are ignored."""
+        assert self._pairs("- ORIGINAL: Цель → ENGLISH: Target") == [("Цель", "Target")]
@@ -0,0 +1,113 @@
+"""Tests for vision.fallback - retries and provider fallback."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from src.vision.base import VisionProviderError, VisionResult
+from src.vision.fallback import FallbackChain
+
+
+class StatusError(Exception):
+    """Error carrying an HTTP status, like the openai/anthropic SDK errors."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _provider(name, *effects):
+    provider = MagicMock(is_available=True)
+    provider.name = name
+    provider.extract_text = AsyncMock(side_effect=list(effects))
+    return provider
+
+
+def _result(name):
+    return VisionResult(extractions=[], provider_name=name)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff():
+    """Make backoff sleeps instant."""
+    with patch("src.vision.fallback.backoff_delay", return_value=0) as delay:
+        yield delay
+
+
+class TestFallbackChainRetry:
+    """Tests for FallbackChain.extract_text retry behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_transient_error_retried_on_same_provider(self, no_backoff):
+        """Test a rate limit is retried with backoff before falling back."""
+        primary = _provider("gemini", StatusError(429), _result("gemini"))
+        backup = _provider("openai", _result("openai"))
+        chain = FallbackChain([primary, backup], max_retries=2)
+
+        result = await chain.extract_text(Image.new("RGB", (8, 8)))
+
+        assert result.provider_name == "gemini"
+        assert primary.extract_text.await_count == 2
+        backup.extract_text.assert_not_awaited()
+        no_backoff.assert_called_once_with(0)
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_falls_back_immediately(self, no_backoff):
+        """Test a non-transient error skips the remaining retries."""
+        primary = _provider("gemini", StatusError(401))
+        backup = _provider("openai", _result("openai"))
+        chain = FallbackChain([primary, backup], max_retries=2)
+
+        result = await chain.extract_text(Image.new("RGB", (8, 8)))
+
+        assert result.provider_name == "openai"
+        assert primary.extract_text.await_count == 1
+        no_backoff.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_all_providers_fail(self):
+        """Test VisionProviderError is raised when retries are exhausted."""
+        primary = _provider("gemini", *[StatusError(503)] * 3)
+        chain = FallbackChain([primary], max_retries=2)
+
+        with pytest.raises(VisionProviderError):
+            await chain.extract_text(Image.new("RGB", (8, 8)))
+        assert primary.extract_text.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limited(self):
+        """Test no more than max_concurrent provider calls run at once."""
+        active = peak = 0
+
+        async def extract(image, prompt):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return _result("gemini")
+
+        provider = _provider("gemini")
+        provider.extract_text = AsyncMock(side_effect=extract)
+        chain = FallbackChain([provider], max_concurrent=2)
+
+        await asyncio.gather(*[chain.extract_text(Image.new("RGB", (8, 8))) for _ in range(5)])
+
+        assert peak == 2
+
+
+class TestFallbackChainWarmup:
+    """Tests for FallbackChain.warmup."""
+
+    def test_warms_every_provider_despite_failures(self):
+        """Test a failing provider warmup does not stop the others."""
+        primary = _provider("gemini")
+        primary.warmup.side_effect = RuntimeError("bad key")
+        backup = _provider("openai")
+
+        FallbackChain([primary, backup]).warmup()
+
+        primary.warmup.assert_called_once()
+        backup.warmup.assert_called_once()